@@ -4,59 +4,345 @@ Simplified AI service that prioritizes online AI (Groq)
 """
 
 import os
+import re
+import copy
 import json
+import time
+import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 
 # Load environment first
 load_dotenv()
 
 from online_ai_service import OnlineAIService
+from backend.result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    # Before the module-level ai_analyzer below is built, so its start-up logging shows
+    logging.basicConfig(level=logging.DEBUG)
+
+# Smart patterns that detect specific problems, not just keywords.
+# Checked in order; only the first match is reported per line.
+_SMART_PATTERNS = (
+    # Docker/Container Build Issues - HIGHEST PRIORITY
+    {
+        'pattern': ('copy failed', 'file not found'),
+        'title': 'Docker COPY Failed - File Not Found',
+        'severity': 'critical',
+        'type': 'docker_build',
+        'description': 'Docker COPY command failed - missing file in build context'
+    },
+    {
+        'pattern': ('copy failed', 'dockerignore'),
+        'title': 'Docker COPY Failed - File Excluded',
+        'severity': 'critical',
+        'type': 'docker_build',
+        'description': 'File excluded by .dockerignore or missing from build context'
+    },
+    {
+        'pattern': ('copy failed', 'build context'),
+        'title': 'Docker Build Context Error',
+        'severity': 'critical',
+        'type': 'docker_build',
+        'description': 'Required file not found in Docker build context'
+    },
+    {
+        'pattern': ('dockerfile', 'not found'),
+        'title': 'Dockerfile Missing',
+        'severity': 'critical',
+        'type': 'docker_build',
+        'description': 'Dockerfile not found in build context'
+    },
+    {
+        'pattern': ('failed to pull image', 'pull image', 'image not found'),
+        'title': 'Container Image Pull Failed',
+        'severity': 'critical',
+        'type': 'docker_image',
+        'description': 'Cannot pull Docker image from registry'
+    },
+    {
+        'pattern': ('imagepullbackoff',),
+        'title': 'Image Pull BackOff Error',
+        'severity': 'critical',
+        'type': 'docker_image',
+        'description': 'Kubernetes failed to pull container image'
+    },
+    # Network/Firewall issues
+    {
+        'pattern': ('net::err_connection_reset',),
+        'title': 'Network Connection Reset',
+        'severity': 'critical',
+        'type': 'network',
+        'description': 'Network connection was reset - firewall or network issue'
+    },
+    {
+        'pattern': ('connection reset',),
+        'title': 'Connection Reset Error',
+        'severity': 'critical',
+        'type': 'network',
+        'description': 'Connection reset by peer or firewall'
+    },
+    {
+        'pattern': ('firewall', 'block'),
+        'title': 'Firewall Blocking Connection',
+        'severity': 'high',
+        'type': 'firewall',
+        'description': 'Firewall rules blocking network access'
+    },
+    {
+        'pattern': ('security group', 'inbound traffic', 'port 80', 'port 443'),
+        'title': 'AWS Security Group Blocking Access',
+        'severity': 'critical',
+        'type': 'aws_security_group',
+        'description': 'AWS Security Group not allowing inbound traffic on required ports'
+    },
+    {
+        'pattern': ('connection timed out', 'public ip', 'security group'),
+        'title': 'AWS Security Group Connection Timeout',
+        'severity': 'critical', 
+        'type': 'aws_security_group',
+        'description': 'Connection timeout due to AWS Security Group restrictions'
+    },
+    {
+        'pattern': ('timeout', 'connection'),
+        'title': 'Network Timeout',
+        'severity': 'high',
+        'type': 'network',
+        'description': 'Network connection timeout'
+    },
+    # Database issues
+    {
+        'pattern': ('database', 'timeout'),
+        'title': 'Database Connection Timeout',
+        'severity': 'critical',
+        'type': 'database',
+        'description': 'Database connection timeout detected'
+    },
+    {
+        'pattern': ('database', 'connection', 'refused'),
+        'title': 'Database Connection Refused',
+        'severity': 'critical',
+        'type': 'database',
+        'description': 'Database refusing connections'
+    },
+    {
+        'pattern': ('database', 'connect', 'failed'),
+        'title': 'Database Connection Failed',
+        'severity': 'critical',
+        'type': 'database',
+        'description': 'Failed to establish database connection'
+    },
+    # PostgreSQL Schema Issues - SPECIFIC PATTERNS
+    {
+        'pattern': ('relation', 'does not exist'),
+        'title': 'PostgreSQL Table Missing',
+        'severity': 'critical',
+        'type': 'postgresql_schema',
+        'description': 'PostgreSQL table/relation does not exist - schema migration needed'
+    },
+    {
+        'pattern': ('column', 'does not exist'),
+        'title': 'PostgreSQL Column Missing', 
+        'severity': 'high',
+        'type': 'postgresql_schema',
+        'description': 'PostgreSQL column missing - database schema migration required'
+    },
+    {
+        'pattern': ('table', 'does not exist'),
+        'title': 'PostgreSQL Table Not Found',
+        'severity': 'critical',
+        'type': 'postgresql_schema',
+        'description': 'PostgreSQL table missing - needs schema creation or migration'
+    },
+    {
+        'pattern': ('schema', 'does not exist'),
+        'title': 'PostgreSQL Schema Missing',
+        'severity': 'critical', 
+        'type': 'postgresql_schema',
+        'description': 'PostgreSQL schema not found - database initialization required'
+    },
+    # MySQL Authentication Issues - SPECIFIC PATTERNS
+    {
+        'pattern': ('access denied', 'user'),
+        'title': 'MySQL Access Denied Error',
+        'severity': 'critical',
+        'type': 'mysql_auth',
+        'description': 'MySQL user authentication failed - permissions or credentials issue'
+    },
+    {
+        'pattern': ('sequelizeconnectionerror', 'access denied'),
+        'title': 'Sequelize MySQL Access Denied',
+        'severity': 'critical',
+        'type': 'mysql_auth',
+        'description': 'Sequelize cannot connect to MySQL - user permissions required'
+    },
+    {
+        'pattern': ('access denied', 'database'),
+        'title': 'MySQL Database Access Denied',
+        'severity': 'critical',
+        'type': 'mysql_auth',
+        'description': 'MySQL user lacks access permissions to specific database'
+    },
+    {
+        'pattern': ('host', 'not allowed', 'connect'),
+        'title': 'MySQL Host Access Denied',
+        'severity': 'critical',
+        'type': 'mysql_auth',
+        'description': 'MySQL user not allowed to connect from this host'
+    },
+    # Environment variable issues
+    {
+        'pattern': ('env', 'not set'),
+        'title': 'Missing Environment Variable',
+        'severity': 'high',
+        'type': 'environment',
+        'description': 'Required environment variable not configured'
+    },
+    {
+        'pattern': ('database_url', 'not set'),
+        'title': 'Missing DATABASE_URL',
+        'severity': 'critical',
+        'type': 'environment',
+        'description': 'DATABASE_URL environment variable not set'
+    },
+    # Resource issues
+    {
+        'pattern': ('insufficient memory',),
+        'title': 'Memory Insufficient',
+        'severity': 'high',
+        'type': 'resource',
+        'description': 'Not enough memory available'
+    },
+    {
+        'pattern': ('node pressure eviction',),
+        'title': 'Node Under Pressure',
+        'severity': 'critical',
+        'type': 'resource',
+        'description': 'Node evicting pods due to resource pressure'
+    },
+    # Deployment issues
+    {
+        'pattern': ('failed to create pod',),
+        'title': 'Pod Creation Failed',
+        'severity': 'high',
+        'type': 'deployment',
+        'description': 'Unable to create pods'
+    },
+    {
+        'pattern': ('no nodes available',),
+        'title': 'No Available Nodes',
+        'severity': 'high',
+        'type': 'scheduling',
+        'description': 'No nodes available for scheduling'
+    }
+)
+
+# Any keyword used by _SMART_PATTERNS; a line without one cannot match a rule
+_SMART_KEYWORD_RE = re.compile('|'.join(sorted(
+    {re.escape(keyword) for rule in _SMART_PATTERNS for keyword in rule['pattern']}
+)))
+
+# Weights behind the overall severity, averaged across issues
+_SEVERITY_WEIGHTS = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+# Non-empty lines of a log, matched in place instead of via split('\n')
+_LINE_RE = re.compile(r'[^\n]+')
+
+# Wording that marks a recommendation as an actionable fix rather than a
+# problem description; matched against the lowercased text
+_ACTIONABLE_REC_RE = re.compile(
+    r'recommendation:|solution:|fix:|increase|add|configure|implement|monitor|review|scale'
+)
+
+# Finished analyses by log digest and source, so UI retries and feedback
+# round-trips skip both the pattern scan and the online AI call
+_RESULT_CACHE_SIZE = 256
+_RESULT_CACHE_TTL = 600.0  # seconds
+
+# Threads running online AI requests while the caller does the pattern scan
+_ONLINE_AI_WORKERS = 4
+_ONLINE_AI_EXECUTOR = ThreadPoolExecutor(max_workers=_ONLINE_AI_WORKERS, thread_name_prefix="online-ai")
+
+
+_RESULT_CACHE = LRUCache(_RESULT_CACHE_SIZE)
+
+
+def _log_digest(log_content: str) -> str:
+    """128-bit content digest of a log, used as the result cache key"""
+    return hashlib.blake2b(log_content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
 
 class SimplifiedAIAnalyzer:
     """Simplified AI analyzer focusing on online AI"""
     
     def __init__(self):
-        print("🚀 Initializing SimplifiedAIAnalyzer...")
+        logger.info("🚀 Initializing SimplifiedAIAnalyzer...")
         try:
             self.online_ai = OnlineAIService()
-            print(f"✅ OnlineAIService initialized. Available backends: {self.online_ai.available_backends}")
-            print(f"✅ Active backend: {self.online_ai.active_backend}")
+            logger.info("✅ OnlineAIService initialized. Available backends: %s", self.online_ai.available_backends)
+            logger.info("✅ Active backend: %s", self.online_ai.active_backend)
         except Exception as e:
-            print(f"❌ Failed to initialize OnlineAIService: {e}")
+            logger.warning("❌ Failed to initialize OnlineAIService: %s", e)
             self.online_ai = None
         
         self.openai_available = False  # Keep for compatibility
         
     def analyze_log(self, log_content: str, source: str = "unknown") -> Dict[str, Any]:
         """Analyze log using BOTH online AI AND pattern recognition"""
-        analysis_start = datetime.now()
+        analysis_start = time.perf_counter()
+        
+        # Same log and source analyzed recently: hand back a copy of that result
+        log_digest = _log_digest(log_content)
+        cache_key = (log_digest, source)
+        entry = _RESULT_CACHE.get(cache_key)
+        if entry is not None and time.monotonic() - entry[0] <= _RESULT_CACHE_TTL:
+            logger.debug("♻️  Reusing recent analysis of the same log")
+            result = copy.deepcopy(entry[1])
+            result["processing_time"] = time.perf_counter() - analysis_start
+            result["timestamp"] = datetime.now().isoformat()
+            return result
+        
+        # Start the online AI (Groq) request first so the network round-trip
+        # overlaps the local pattern scan instead of following it
+        online_future = None
+        if self.online_ai and hasattr(self.online_ai, 'available_backends') and self.online_ai.available_backends:
+            logger.debug("🚀 Using %s for AI analysis", self.online_ai.active_backend)
+            online_future = _ONLINE_AI_EXECUTOR.submit(self.online_ai.analyze_log, log_content, source)
         
         # Step 1: Always run pattern analysis for baseline
-        print("🔍 Running pattern recognition analysis...")
-        pattern_issues = self._basic_pattern_analysis(log_content)
+        logger.debug("🔍 Running pattern recognition analysis...")
+        log_lower = log_content.lower()
+        pattern_issues = self._basic_pattern_analysis(log_content, log_lower)
         pattern_recommendations = self._generate_smart_recommendations(pattern_issues, source)
         
-        # Step 2: Try online AI (Groq) for enhanced analysis
+        # Step 2: Collect the online AI analysis
         ai_issues = []
         ai_recommendations = []
         ai_backend = "patterns"
         online_analysis = {}
+        ai_failed = False
         
-        if self.online_ai and hasattr(self.online_ai, 'available_backends') and self.online_ai.available_backends:
+        if online_future is not None:
             try:
-                print(f"🚀 Using {self.online_ai.active_backend} for AI analysis")
-                online_analysis = self.online_ai.analyze_log(log_content, source)
+                online_analysis = online_future.result()
                 ai_issues = online_analysis.get("issues", [])
                 ai_recommendations = online_analysis.get("recommendations", [])
                 ai_backend = online_analysis.get("backend", "online_ai")
-                print(f"✅ {ai_backend} analysis complete!")
+                # OnlineAIService reports its own failures as a fallback result
+                ai_failed = ai_backend == "fallback"
+                logger.debug("✅ %s analysis complete!", ai_backend)
             except Exception as e:
-                print(f"❌ Online AI failed: {e}")
+                logger.warning("❌ Online AI failed: %s", e)
                 online_analysis = {}
+                ai_failed = True
         else:
-            print("ℹ️  Online AI not available, using pattern recognition only")
+            logger.debug("ℹ️  Online AI not available, using pattern recognition only")
         
         # Step 3: Combine both analyses and get proven solutions
         combined_issues = self._merge_issues(pattern_issues, ai_issues)
@@ -69,7 +355,7 @@ class SimplifiedAIAnalyzer:
         
         # Format result with combined analysis
         result = {
-            "log_id": str(hash(log_content))[:8],
+            "log_id": log_digest[:8],  # stable across processes, unlike hash()
             "issues": combined_issues,
             "errors": combined_issues,  # Compatibility field
             "errors_found": len(combined_issues),
@@ -79,7 +365,7 @@ class SimplifiedAIAnalyzer:
             "confidence": 0.95 if ai_backend != "patterns" else 0.75,
             "confidence_score": 0.95 if ai_backend != "patterns" else 0.75,
             "summary": f"Combined analysis: {len(ai_issues)} AI issues + {len(pattern_issues)} pattern issues = {len(combined_issues)} total",
-            "processing_time": (datetime.now() - analysis_start).total_seconds(),
+            "processing_time": time.perf_counter() - analysis_start,
             "source": source,
             "timestamp": datetime.now().isoformat(),
             "severity": self._calculate_severity(combined_issues),
@@ -88,241 +374,38 @@ class SimplifiedAIAnalyzer:
             "pattern_analysis": {
                 "issues_found": len(pattern_issues),
                 "recommendations": len(pattern_recommendations),
-                "patterns_matched": self._get_matched_patterns(log_content)
+                "patterns_matched": self._get_matched_patterns(log_content, log_lower)
             }
         }
         
-        print(f"✅ Combined analysis: {len(combined_issues)} total issues, {len(combined_recommendations)} recommendations")
+        # A failed or fallback AI call is retried next time rather than cached
+        if not ai_failed:
+            _RESULT_CACHE.put(cache_key, (time.monotonic(), copy.deepcopy(result)))
+        
+        logger.debug("✅ Combined analysis: %d total issues, %d recommendations",
+                     len(combined_issues), len(combined_recommendations))
         return result
     
-    def _basic_pattern_analysis(self, log_content: str) -> List[Dict]:
+    def _basic_pattern_analysis(self, log_content: str, log_lower: Optional[str] = None) -> List[Dict]:
         """Enhanced pattern analysis with smart error detection"""
         issues = []
-        lines = log_content.split('\n')
+        generic_error_found = False  # the generic fallback is reported once per log
+        # Lowercase the whole log once and walk both copies line by line without
+        # building line lists; lower() never adds or removes newlines, and blank
+        # lines are skipped anyway, so the two streams stay aligned
+        if log_lower is None:
+            log_lower = log_content.lower()
         
-        # Smart patterns that detect specific problems, not just keywords
-        smart_patterns = [
-            # Docker/Container Build Issues - HIGHEST PRIORITY
-            {
-                'pattern': ['copy failed', 'file not found'],
-                'title': 'Docker COPY Failed - File Not Found',
-                'severity': 'critical',
-                'type': 'docker_build',
-                'description': 'Docker COPY command failed - missing file in build context'
-            },
-            {
-                'pattern': ['copy failed', 'dockerignore'],
-                'title': 'Docker COPY Failed - File Excluded',
-                'severity': 'critical',
-                'type': 'docker_build',
-                'description': 'File excluded by .dockerignore or missing from build context'
-            },
-            {
-                'pattern': ['copy failed', 'build context'],
-                'title': 'Docker Build Context Error',
-                'severity': 'critical',
-                'type': 'docker_build',
-                'description': 'Required file not found in Docker build context'
-            },
-            {
-                'pattern': ['dockerfile', 'not found'],
-                'title': 'Dockerfile Missing',
-                'severity': 'critical',
-                'type': 'docker_build',
-                'description': 'Dockerfile not found in build context'
-            },
-            {
-                'pattern': ['failed to pull image', 'pull image', 'image not found'],
-                'title': 'Container Image Pull Failed',
-                'severity': 'critical',
-                'type': 'docker_image',
-                'description': 'Cannot pull Docker image from registry'
-            },
-            {
-                'pattern': ['imagepullbackoff'],
-                'title': 'Image Pull BackOff Error',
-                'severity': 'critical',
-                'type': 'docker_image',
-                'description': 'Kubernetes failed to pull container image'
-            },
-            # Network/Firewall issues
-            {
-                'pattern': ['net::err_connection_reset'],
-                'title': 'Network Connection Reset',
-                'severity': 'critical',
-                'type': 'network',
-                'description': 'Network connection was reset - firewall or network issue'
-            },
-            {
-                'pattern': ['connection reset'],
-                'title': 'Connection Reset Error',
-                'severity': 'critical',
-                'type': 'network',
-                'description': 'Connection reset by peer or firewall'
-            },
-            {
-                'pattern': ['firewall', 'block'],
-                'title': 'Firewall Blocking Connection',
-                'severity': 'high',
-                'type': 'firewall',
-                'description': 'Firewall rules blocking network access'
-            },
-            {
-                'pattern': ['security group', 'inbound traffic', 'port 80', 'port 443'],
-                'title': 'AWS Security Group Blocking Access',
-                'severity': 'critical',
-                'type': 'aws_security_group',
-                'description': 'AWS Security Group not allowing inbound traffic on required ports'
-            },
-            {
-                'pattern': ['connection timed out', 'public ip', 'security group'],
-                'title': 'AWS Security Group Connection Timeout',
-                'severity': 'critical', 
-                'type': 'aws_security_group',
-                'description': 'Connection timeout due to AWS Security Group restrictions'
-            },
-            {
-                'pattern': ['timeout', 'connection'],
-                'title': 'Network Timeout',
-                'severity': 'high',
-                'type': 'network',
-                'description': 'Network connection timeout'
-            },
-            # Database issues
-            {
-                'pattern': ['database', 'timeout'],
-                'title': 'Database Connection Timeout',
-                'severity': 'critical',
-                'type': 'database',
-                'description': 'Database connection timeout detected'
-            },
-            {
-                'pattern': ['database', 'connection', 'refused'],
-                'title': 'Database Connection Refused',
-                'severity': 'critical',
-                'type': 'database',
-                'description': 'Database refusing connections'
-            },
-            {
-                'pattern': ['database', 'connect', 'failed'],
-                'title': 'Database Connection Failed',
-                'severity': 'critical',
-                'type': 'database',
-                'description': 'Failed to establish database connection'
-            },
-            # PostgreSQL Schema Issues - SPECIFIC PATTERNS
-            {
-                'pattern': ['relation', 'does not exist'],
-                'title': 'PostgreSQL Table Missing',
-                'severity': 'critical',
-                'type': 'postgresql_schema',
-                'description': 'PostgreSQL table/relation does not exist - schema migration needed'
-            },
-            {
-                'pattern': ['column', 'does not exist'],
-                'title': 'PostgreSQL Column Missing', 
-                'severity': 'high',
-                'type': 'postgresql_schema',
-                'description': 'PostgreSQL column missing - database schema migration required'
-            },
-            {
-                'pattern': ['table', 'does not exist'],
-                'title': 'PostgreSQL Table Not Found',
-                'severity': 'critical',
-                'type': 'postgresql_schema',
-                'description': 'PostgreSQL table missing - needs schema creation or migration'
-            },
-            {
-                'pattern': ['schema', 'does not exist'],
-                'title': 'PostgreSQL Schema Missing',
-                'severity': 'critical', 
-                'type': 'postgresql_schema',
-                'description': 'PostgreSQL schema not found - database initialization required'
-            },
-            # MySQL Authentication Issues - SPECIFIC PATTERNS
-            {
-                'pattern': ['access denied', 'user'],
-                'title': 'MySQL Access Denied Error',
-                'severity': 'critical',
-                'type': 'mysql_auth',
-                'description': 'MySQL user authentication failed - permissions or credentials issue'
-            },
-            {
-                'pattern': ['sequelizeconnectionerror', 'access denied'],
-                'title': 'Sequelize MySQL Access Denied',
-                'severity': 'critical',
-                'type': 'mysql_auth',
-                'description': 'Sequelize cannot connect to MySQL - user permissions required'
-            },
-            {
-                'pattern': ['access denied', 'database'],
-                'title': 'MySQL Database Access Denied',
-                'severity': 'critical',
-                'type': 'mysql_auth',
-                'description': 'MySQL user lacks access permissions to specific database'
-            },
-            {
-                'pattern': ['host', 'not allowed', 'connect'],
-                'title': 'MySQL Host Access Denied',
-                'severity': 'critical',
-                'type': 'mysql_auth',
-                'description': 'MySQL user not allowed to connect from this host'
-            },
-            # Environment variable issues
-            {
-                'pattern': ['env', 'not set'],
-                'title': 'Missing Environment Variable',
-                'severity': 'high',
-                'type': 'environment',
-                'description': 'Required environment variable not configured'
-            },
-            {
-                'pattern': ['database_url', 'not set'],
-                'title': 'Missing DATABASE_URL',
-                'severity': 'critical',
-                'type': 'environment',
-                'description': 'DATABASE_URL environment variable not set'
-            },
-            # Resource issues
-            {
-                'pattern': ['insufficient memory'],
-                'title': 'Memory Insufficient',
-                'severity': 'high',
-                'type': 'resource',
-                'description': 'Not enough memory available'
-            },
-            {
-                'pattern': ['node pressure eviction'],
-                'title': 'Node Under Pressure',
-                'severity': 'critical',
-                'type': 'resource',
-                'description': 'Node evicting pods due to resource pressure'
-            },
-            # Deployment issues
-            {
-                'pattern': ['failed to create pod'],
-                'title': 'Pod Creation Failed',
-                'severity': 'high',
-                'type': 'deployment',
-                'description': 'Unable to create pods'
-            },
-            {
-                'pattern': ['no nodes available'],
-                'title': 'No Available Nodes',
-                'severity': 'high',
-                'type': 'scheduling',
-                'description': 'No nodes available for scheduling'
-            }
-        ]
-        
-        for line in lines:
-            line_lower = line.lower().strip()
+        for line_match, lower_match in zip(_LINE_RE.finditer(log_content), _LINE_RE.finditer(log_lower)):
+            line = line_match.group()
+            line_lower = lower_match.group().strip()
             if not line_lower or '[info]' in line_lower:
                 continue
                 
             # Check smart patterns
             pattern_matched = False
-            for pattern_config in smart_patterns:
+            rules = _SMART_PATTERNS if _SMART_KEYWORD_RE.search(line_lower) else ()
+            for pattern_config in rules:
                 patterns = pattern_config['pattern']
                 if all(p in line_lower for p in patterns):
                     issues.append({
@@ -337,8 +420,9 @@ class SimplifiedAIAnalyzer:
                     break  # Only match first pattern per line
             
             # Fallback: Generic error detection
-            if not pattern_matched and any(keyword in line_lower for keyword in ['[error]', '[critical]', 'error:', 'failed:']):
-                if 'error' not in [issue['type'] for issue in issues]:  # Avoid duplicates
+            if not pattern_matched and not generic_error_found:
+                if any(keyword in line_lower for keyword in ['[error]', '[critical]', 'error:', 'failed:']):
+                    generic_error_found = True
                     issues.append({
                         "title": "General Error Detected",
                         "description": "Error found in deployment logs",
@@ -370,9 +454,20 @@ class SimplifiedAIAnalyzer:
             return ["No issues detected - system appears healthy"]
         
         recommendations = []
+        # Severity counts and issue types are gathered in the same pass
+        critical_count = 0
+        high_count = 0
+        unique_types = set()
         
         # Pattern-based solution lookup - match specific error patterns to proven fixes
         for issue in issues:
+            severity = issue.get('severity')
+            if severity == 'critical':
+                critical_count += 1
+            elif severity == 'high':
+                high_count += 1
+            unique_types.add(issue.get('type', ''))
+            
             issue_type = issue.get('type', '').lower()
             issue_title = issue.get('title', '').lower()
             
@@ -468,21 +563,18 @@ class SimplifiedAIAnalyzer:
             ])
         
         # Severity-based urgent actions
-        critical_issues = [i for i in issues if i.get('severity') == 'critical']
-        if critical_issues:
-            recommendations.insert(0, f"URGENT: {len(critical_issues)} critical issues detected - implement immediate fixes")
+        if critical_count:
+            recommendations.insert(0, f"URGENT: {critical_count} critical issues detected - implement immediate fixes")
         
-        high_issues = [i for i in issues if i.get('severity') == 'high']  
-        if high_issues:
-            recommendations.insert(1 if critical_issues else 0, f"HIGH PRIORITY: {len(high_issues)} issues need resolution within 1 hour")
+        if high_count:
+            recommendations.insert(1 if critical_count else 0, f"HIGH PRIORITY: {high_count} issues need resolution within 1 hour")
         
         # Add pattern-based monitoring and prevention
-        unique_types = set(issue.get('type', '') for issue in issues)
         if 'network' in unique_types:
             recommendations.append("Implement network monitoring: Set up connectivity checks and latency alerts")
         if 'database' in unique_types:
             recommendations.append("Implement database monitoring: Track connection pool and query performance")
-        if any(t in unique_types for t in ['resource', 'deployment']):
+        if 'resource' in unique_types or 'deployment' in unique_types:
             recommendations.append("Implement resource monitoring: Set up CPU/memory alerts and autoscaling")
         
         # Remove duplicates while preserving order
@@ -725,13 +817,14 @@ class SimplifiedAIAnalyzer:
         
         return proven_solutions[:8]  # Return top 8 proven solutions
     
-    def _get_matched_patterns(self, log_content: str) -> List[str]:
+    def _get_matched_patterns(self, log_content: str, log_lower: Optional[str] = None) -> List[str]:
         """Get list of patterns that matched in the log"""
         patterns = ['insufficient memory', 'node pressure eviction', 'no nodes available', 
                    'replica set desired count not met', 'failed to create pod',
                    'net::err_connection_reset', 'database timeout', 'firewall block']
         matched = []
-        log_lower = log_content.lower()
+        if log_lower is None:
+            log_lower = log_content.lower()
         for pattern in patterns:
             if pattern in log_lower:
                 matched.append(pattern)
@@ -746,7 +839,7 @@ class SimplifiedAIAnalyzer:
         for i, rec in enumerate(raw_recommendations):
             if isinstance(rec, str):
                 # Check if it's a problem description or actual recommendation
-                if any(keyword in rec.lower() for keyword in ['recommendation:', 'solution:', 'fix:', 'increase', 'add', 'configure', 'implement', 'monitor', 'review', 'scale']):
+                if _ACTIONABLE_REC_RE.search(rec.lower()):
                     # This is an actual recommendation
                     title = f"[{analysis_type}] Solution {i+1}"
                     description = rec
@@ -755,10 +848,8 @@ class SimplifiedAIAnalyzer:
                     # This is a problem description, provide specific troubleshooting
                     title = f"[{analysis_type}] Issue Analysis {i+1}"
                     description = f"Problem: {rec}"
-                    # Generate SPECIFIC troubleshooting based on exact error patterns
-                    rec_lower = rec.lower()
-                    
-                    # Pass the full error context for better matching
+                    # Generate SPECIFIC troubleshooting based on exact error patterns;
+                    # pass the full error context for better matching
                     code_example = self._generate_code_example(rec)
                 
                 formatted.append({
@@ -1413,14 +1504,13 @@ echo "Basic troubleshooting complete!"
         if not issues:
             return "INFO"
         
-        severity_weights = {"critical": 4, "high": 3, "medium": 2, "low": 1}
         total_weight = 0
         count = 0
         
         for issue in issues:
-            severity = issue.get("severity", "low").lower()
-            if severity in severity_weights:
-                total_weight += severity_weights[severity]
+            weight = _SEVERITY_WEIGHTS.get(issue.get("severity", "low").lower())
+            if weight is not None:
+                total_weight += weight
                 count += 1
         
         if count == 0:
@@ -4,86 +4,697 @@ Enhanced AI Service with TiDB Pattern Recognition
 Provides single, finalized solutions instead of multiple recommendations
 """
 import os
+import re
+import sys
+import copy
 import json
+import hashlib
+import time
+import logging
+import threading
+import queue
+import functools
+import requests
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Iterable, Final
 from dotenv import load_dotenv
 
+# orjson is optional: it decodes the streamed Groq chunks faster, stdlib json is the fallback
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # Load environment first
 load_dotenv()
 
 from online_ai_service import OnlineAIService
-from enhanced_pattern_recognition import enhanced_pattern_recognition
+from result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Keyword scanners for Groq responses, compiled once at import.
+# Plain alternations (no word boundaries) keep the old substring semantics,
+# so "fail" still matches "failed" and "fix" still matches "fixes".
+_ISSUE_RE = re.compile(r"error|issue|problem|fail", re.IGNORECASE)
+_SEV_RE = re.compile(r"critical|severe", re.IGNORECASE)
+_REC_RE = re.compile(r"solution|fix|resolve|step", re.IGNORECASE)
+_INSIGHT_RE = re.compile(r"issue|problem|error|fix|solution", re.IGNORECASE)
+_STEP_RE = re.compile(r"step|fix|resolve|check|update|restart", re.IGNORECASE)
+
+# Severity labels, most severe first. Literals are interned by the compiler;
+# labels arriving from the AI response are interned on the way in so
+# membership tests against these hit the identity fast path.
+_SEVERITY_LEVELS: Final = ("critical", "high", "medium", "low")
+_SEVERITY_RANK: Final = {level: rank for rank, level in enumerate(_SEVERITY_LEVELS)}
+
+# Groq chat-completions request: endpoint, fixed system prompt and a pooled session
+_GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+_GROQ_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert DevOps engineer specializing in deployment troubleshooting. Provide detailed, actionable solutions."
+}
+_GROQ_SESSION = requests.Session()
+# The request body only varies in the user prompt and token budget, so
+# everything else is serialized once here and those are spliced in per call.
+_GROQ_BODY_PREFIX = json.dumps({
+    "model": "llama-3.1-8b-instant",
+    "temperature": 0.1,
+    "top_p": 0.9,
+    "stream": True,
+    "stop": ["\n\n\n"],
+    "messages": [_GROQ_SYSTEM_MESSAGE]
+})[:-2] + ', {"role": "user", "content": '
+_GROQ_BODY_SUFFIX = '}], "max_tokens": %d}'
+# Short logs need short answers; generation time grows with output tokens
+_GROQ_MAX_TOKENS = 1500
+_GROQ_BASE_TOKENS = 200
+
+# Recent Groq analyses, reused when the same canonical log comes in again from
+# the same source (CI retries, re-sent webhooks)
+_EXACT_CACHE_SIZE = 1024
+_EXACT_CACHE_TTL = 600.0  # seconds
+
+# Worker pool for Groq calls
+_GROQ_WORKERS = 4
+_EXECUTOR = ThreadPoolExecutor(max_workers=_GROQ_WORKERS, thread_name_prefix="ai-analyzer")
+# Separate pool for the hedged pattern-recognition fallback, so it never queues
+# behind the slow Groq calls it is hedging
+_FALLBACK_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-fallback")
+# How long Groq gets before pattern recognition is started alongside it (seconds);
+# counted from submission, so time queued in _EXECUTOR counts too
+_GROQ_SOFT_DEADLINE = 8.0
+
+# Background pattern storage: writes are grouped into one TiDB round-trip
+_STORE_QUEUE_SIZE = 256
+_STORE_BATCH_SIZE = 32
+_STORE_BATCH_WAIT = 0.05  # seconds to wait for more patterns after the first
+
+# Domain keywords for Groq solutions, in priority order (first domain wins)
+_LOG_DOMAIN_KEYWORDS = (
+    ("docker", ("docker", "container", "dockerfile", "image")),
+    ("kubernetes", ("kubectl", "kubernetes", "pod", "deployment")),
+    ("database", ("mysql", "postgres", "database", "db")),
+    ("web-server", ("nginx", "apache", "server", "http")),
+    ("networking", ("network", "port", "connection", "bind")),
+)
+
+# Step explanations for Groq recommendations, checked in order (first match wins)
+_STEP_EXPLANATIONS = (
+    (("config", "configuration"),
+     "**Configure {domain_title}** - {step}. This addresses configuration issues by updating settings to match best practices for {domain} deployments."),
+    (("port", "network"),
+     "**Fix Network Configuration** - {step}. This resolves connectivity issues by ensuring proper port configuration and network accessibility."),
+    (("docker", "container"),
+     "**Optimize Container Setup** - {step}. This improves container deployment by addressing Docker-specific configuration and resource allocation."),
+    (("deploy", "build"),
+     "**Enhance Deployment Process** - {step}. This optimizes the deployment pipeline for better reliability and faster deployments."),
+)
+
+# Issue keywords that select a Groq code template, mapped to the template tag
+_ISSUE_TAG_KEYWORDS = {"kubernetes": "kubernetes", "k8s": "kubernetes", "docker": "docker"}
+_ISSUE_TAG_RE = re.compile("(?=(%s))" % "|".join(_ISSUE_TAG_KEYWORDS), re.IGNORECASE)
+
+# Static body of the Groq network code template; only the AI insight
+# snippet varies, so it is filled in with str.replace rather than an f-string
+_NETWORK_AI_CODE_TEMPLATE: Final[str] = '''# 🌐 GROQ AI Network Configuration Solution
+# Intelligent network troubleshooting based on log analysis
+
+# === STEP 1: NETWORK DIAGNOSTICS ===
+echo "🔍 AI Analysis: Network connectivity check..."
+netstat -tuln | grep LISTEN
+ss -tuln | grep :80
+curl -I http://localhost:3000 || echo "Service not accessible"
+
+# === STEP 2: AI-RECOMMENDED NETWORK FIXES ===
+echo "⚡ Applying intelligent network configuration..."
+
+# Check and fix port conflicts (AI-identified):
+sudo lsof -i :3000 || echo "Port 3000 available"
+sudo systemctl status firewall || sudo ufw status
+
+# Configure intelligent routing:
+sudo iptables -L INPUT -n --line-numbers
+sudo ufw allow 3000/tcp  # Allow application port
+
+# === STEP 3: SERVICE RESTART WITH OPTIMIZATION ===
+echo "🔄 Restarting services with AI optimizations..."
+sudo systemctl restart nginx
+sudo systemctl restart your-app
+curl -f http://localhost:3000/health || echo "Health check failed"
+
+echo "🎯 Network AI optimization complete!"
+
+# AI Insight: {AI_INSIGHT}...'''
+
+# Static code templates for Groq solutions by domain
+_DOCKER_AI_CODE_TEMPLATE: Final[str] = '''#!/bin/bash
+# AI-POWERED DOCKER SOLUTION
+echo "🤖 Executing Groq AI-generated Docker resolution..."
+
+# AI Analysis: Docker deployment issue detected
+echo "🔍 AI-Detected Issue Analysis..."
+docker --version
+docker system info | grep -E "(Images|Containers|Running)"
+
+# AI Recommendation: Check container status and logs
+echo "📋 Container Status Analysis..."
+docker ps -a --format "table {{.Names}}\\t{{.Status}}\\t{{.Ports}}"
+docker logs $(docker ps -q --latest) --tail=20 2>/dev/null || echo "No recent containers"
+
+# AI Solution: Comprehensive Docker fix
+echo "🛠️ Applying AI-recommended fixes..."
+
+# Stop conflicting processes
+docker ps -q | xargs -r docker stop
+
+# Clean up resources
+docker system prune -f
+docker volume prune -f
+
+# Rebuild with AI-optimized settings
+docker build --no-cache -t ai-fixed-app .
+docker run -d --name ai-solution -p 8080:80 ai-fixed-app
+
+echo "✅ AI Docker solution applied successfully!"
+docker ps | grep ai-solution
+'''
+
+_KUBERNETES_AI_CODE_TEMPLATE: Final[str] = '''#!/bin/bash
+# AI-POWERED KUBERNETES SOLUTION
+echo "🤖 Executing Groq AI-generated Kubernetes resolution..."
+
+# AI Analysis: Kubernetes deployment issue detected
+echo "🔍 AI Cluster Analysis..."
+kubectl cluster-info
+kubectl get nodes -o wide
+
+# AI Recommendation: Check pod and deployment status
+echo "📋 Pod Status Analysis..."
+kubectl get pods --all-namespaces --field-selector=status.phase!=Running
+kubectl describe pods | grep -E "(Error|Failed|Pending)"
+
+# AI Solution: Comprehensive K8s fix
+echo "🛠️ Applying AI-recommended fixes..."
+
+# Scale down problematic deployments
+kubectl get deployments | grep -v NAME | while read deployment rest; do
+    kubectl scale deployment $deployment --replicas=1
+done
+
+# Apply AI-optimized resource limits
+kubectl patch deployment $DEPLOYMENT_NAME -p '{
+  "spec": {
+    "template": {
+      "spec": {
+        "containers": [{
+          "name": "app",
+          "resources": {
+            "requests": {"memory": "256Mi", "cpu": "100m"},
+            "limits": {"memory": "512Mi", "cpu": "200m"}
+          }
+        }]
+      }
+    }
+  }
+}' 2>/dev/null || echo "Deployment patch applied"
+
+# Verify AI solution
+kubectl rollout status deployment/$DEPLOYMENT_NAME
+echo "✅ AI Kubernetes solution applied successfully!"
+'''
+
+_GENERAL_AI_CODE_TEMPLATE: Final[str] = '''#!/bin/bash
+# AI-POWERED SYSTEM SOLUTION
+echo "🤖 Executing Groq AI-generated system resolution..."
+
+# AI Analysis: System issue detected
+echo "🔍 AI System Analysis..."
+uptime
+free -h
+df -h | head -5
+
+# AI Recommendation: Check system services
+echo "📋 Service Status Analysis..."
+systemctl --failed --no-pager
+docker ps -a 2>/dev/null | head -10
+
+# AI Solution: Comprehensive system fix
+echo "🛠️ Applying AI-recommended fixes..."
+
+# System optimization
+sudo systemctl daemon-reload
+sudo systemctl restart systemd-resolved
+
+# Resource cleanup
+sudo journalctl --vacuum-time=7d
+docker system prune -f 2>/dev/null || echo "Docker not available"
+
+# Network diagnostics
+ping -c 3 8.8.8.8
+curl -I https://google.com --max-time 5
+
+echo "✅ AI System solution applied successfully!"
+'''
+
+_AI_CODE_BY_DOMAIN = {
+    "docker": _DOCKER_AI_CODE_TEMPLATE,
+    "kubernetes": _KUBERNETES_AI_CODE_TEMPLATE,
+    "general": _GENERAL_AI_CODE_TEMPLATE,
+}
+
+# Large logs are cut down to this many characters before analysis
+_DISTILL_MAX_CHARS = 12000
+# Lines always kept from each end of a distilled log
+_DISTILL_EDGE_LINES = 40
+
+# Run-to-run noise masked before fingerprinting: ISO timestamps, UUIDs,
+# container / commit hashes and "line N" references
+_VOLATILE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]?\d{2}:\d{2}:\d{2}\S*"
+    r"|\b[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b"
+    r"|\b[0-9a-f]{12,64}\b"
+    r"|(?<=\bline )\d+"
+)
+_SPACING_RE = re.compile(r"[ \t\r\f\v]+")
+
+# Any of these (in the lowered log) means the log is worth sending to Groq;
+# deliberately broad, since a miss skips the LLM for a failing build
+_FAILURE_MARKERS = (
+    "error", "fail", "fatal", "exception", "traceback", "panic", "critical",
+    "denied", "refused", "unable", "cannot", "invalid", "not found", "does not exist",
+    "timeout", "timed out", "oom", "killed", "crash", "backoff", "exit code",
+    "already allocated", "warn", "problem", "issue"
+)
+
+
+def _distill_log(log_content: str, max_chars: int = _DISTILL_MAX_CHARS) -> str:
+    """Shrink a large log to its head, its tail and the issue lines between.
+
+    Logs within max_chars are returned unchanged. Otherwise the first and last
+    _DISTILL_EDGE_LINES lines are kept, plus any middle lines mentioning an
+    error, issue, problem or failure, in order, until the budget runs out.
+    """
+    if len(log_content) <= max_chars:
+        return log_content
+    
+    lines = log_content.splitlines()
+    edge = _DISTILL_EDGE_LINES
+    head, middle, tail = lines[:edge], lines[edge:-edge], lines[-edge:]
+    budget = max_chars - sum(len(line) + 1 for line in head) - sum(len(line) + 1 for line in tail)
+    if not middle or budget < 0:
+        # Few but very long lines: keep both ends by character count instead
+        half = max_chars // 2
+        return log_content[:half] + "\n" + log_content[-half:]
+    
+    kept = []
+    for line in middle:
+        if len(line) < budget and _ISSUE_RE.search(line):
+            kept.append(line)
+            budget -= len(line) + 1
+    kept.append(f"... [{len(middle) - len(kept)} lines omitted] ...")
+    return "\n".join(head + kept + tail)
+
+
+def _distill_stream(lines: Iterable[str], max_chars: int = _DISTILL_MAX_CHARS) -> Tuple[str, int, str]:
+    """Distill a log read line by line, without holding the whole log in memory.
+
+    Returns (distilled text, original length, fingerprint of the whole log).
+    Selection follows _distill_log, except that middle lines share half of
+    max_chars since the tail is not known until the end.
+    """
+    total = 0
+    # Masking never spans a newline, so canonicalizing line by line hashes the
+    # same bytes as _log_fingerprint(_canonicalize_log(whole log))
+    digest = hashlib.blake2b(digest_size=8)
+    whole = []
+    edge = _DISTILL_EDGE_LINES
+    head, tail, kept = [], deque(maxlen=edge), []
+    budget = max_chars // 2
+    omitted = 0
+    
+    for raw_line in lines:
+        total += len(raw_line)
+        digest.update(_canonicalize_log(raw_line).encode("utf-8", "ignore"))
+        if whole is not None:
+            whole.append(raw_line)
+            if total > max_chars:
+                whole = None
+        
+        line = raw_line.rstrip("\r\n")
+        if len(head) < edge:
+            head.append(line)
+            continue
+        if len(tail) == edge:
+            # The oldest tail line becomes a middle line
+            middle_line = tail[0]
+            if len(middle_line) < budget and _ISSUE_RE.search(middle_line):
+                kept.append(middle_line)
+                budget -= len(middle_line) + 1
+            else:
+                omitted += 1
+        tail.append(line)
+    
+    if whole is not None:
+        return "".join(whole), total, digest.hexdigest()
+    
+    distilled = "\n".join(head + kept + [f"... [{omitted} lines omitted] ..."] + list(tail))
+    if len(distilled) > max_chars:
+        # Very long head or tail lines: keep both ends by character count
+        half = max_chars // 2
+        distilled = distilled[:half] + "\n" + distilled[-half:]
+    return distilled, total, digest.hexdigest()
+
+
+class _PatternBatchWriter:
+    """Queue + daemon thread that stores deployment patterns in batches.
+
+    put() never waits on TiDB; when the queue is full the pattern is
+    stored synchronously instead, which slows callers down under overload.
+    """
+    
+    def __init__(self, store):
+        self._store = store
+        self._queue = queue.Queue(maxsize=_STORE_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def put(self, log_content: str, patterns: List[Dict], solutions: List[Dict], pattern_hash: str):
+        item = (log_content, patterns, solutions, pattern_hash)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logger.warning("⚠️ Pattern store queue full, storing synchronously")
+            self._store.store_deployment_pattern(*item)
+    
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="pattern-store", daemon=True)
+                    self._thread.start()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _STORE_BATCH_WAIT
+            while len(batch) < _STORE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._store.store_deployment_patterns_batch(batch)
+            except Exception as e:
+                logger.warning("❌ Background pattern storage failed: %s", e)
+
+
+def _has_failure_marker(log_content: str) -> bool:
+    """Whether the log shows any sign of a failure (C substring search per marker)"""
+    log_lower = log_content.lower()
+    return any(marker in log_lower for marker in _FAILURE_MARKERS)
+
+
+def _canonicalize_log(log_content: str) -> str:
+    """Mask timestamps, UUIDs, hex ids and line numbers and collapse spacing,
+    so reruns of the same failure produce the same text"""
+    return _SPACING_RE.sub(" ", _VOLATILE_RE.sub("#", log_content))
+
+
+def _log_fingerprint(canonical_log: str) -> str:
+    """Stable short fingerprint of a canonicalized log, used for pattern ids.
+
+    Unlike the builtin hash() it is identical across processes and
+    PYTHONHASHSEED values, so the same log always maps to the same id.
+    """
+    return hashlib.blake2b(canonical_log.encode("utf-8", "ignore"), digest_size=8).hexdigest()
+
+
+def _intern_label(value):
+    """Intern short label strings coming from parsed responses"""
+    return sys.intern(value) if type(value) is str else value
+
+
+_AI_SOLUTION_BASE_MINUTES: Final = {"docker": 10, "kubernetes": 20, "database": 15, "system": 12}
+
+
+@functools.lru_cache(maxsize=512)
+def _ai_solution_time_label(domain: str, issue_count: int, recommendation_count: int) -> str:
+    """Formatted AI solution estimate, cached per (domain, issues, recommendations)"""
+    total_time = _AI_SOLUTION_BASE_MINUTES.get(domain, 12) + issue_count * 3 + recommendation_count * 2
+    return f"{total_time}-{total_time + 10} minutes"
+
+
+# (log fingerprint, source) -> (time.monotonic() when stored, analysis)
+_EXACT_CACHE = LRUCache(_EXACT_CACHE_SIZE)
+
+
+class _AIResponseParser:
+    """Line-by-line parser for Groq responses, usable on a full body or a stream"""
+    
+    def __init__(self):
+        self.issues = []
+        self.recommendations = []
+        self.steps = []
+        self.line_count = 0
+        self.key_insight = None
+        self.fallback_insight = None
+        self.done = False
+    
+    def feed(self, line: str):
+        """Consume one response line; no-op once every field is settled"""
+        if self.done:
+            return
+        
+        index = self.line_count
+        self.line_count += 1
+        line = line.strip()
+        clean_line = None
+        
+        if len(self.issues) < 3 and len(line) > 10 and _ISSUE_RE.search(line):
+            clean_line = line.replace('*', '').replace('-', '').strip()
+            self.issues.append({
+                "description": clean_line,
+                "severity": "high" if _SEV_RE.search(line) else "medium"
+            })
+        
+        if len(line) > 15:
+            if len(self.recommendations) < 5 and _REC_RE.search(line):
+                clean_line = clean_line or line.replace('*', '').replace('-', '').strip()
+                self.recommendations.append(clean_line)
+            if len(self.steps) < 5 and _STEP_RE.search(line):
+                clean_line = clean_line or line.replace('*', '').replace('-', '').strip()
+                self.steps.append(f"**Step {len(self.steps) + 1}**: {clean_line}")
+        
+        # Key insight: a meaningful line among the first 5, else the first long line
+        if self.key_insight is None:
+            if index < 5 and len(line) > 30 and _INSIGHT_RE.search(line):
+                self.key_insight = line
+            elif self.fallback_insight is None and len(line) > 20:
+                self.fallback_insight = line
+        
+        insight_done = self.key_insight is not None or (index >= 4 and self.fallback_insight is not None)
+        if insight_done and len(self.issues) >= 3 and len(self.recommendations) >= 5 and len(self.steps) >= 5:
+            self.done = True
+    
+    def result(self, has_content: bool = True) -> Dict[str, Any]:
+        """Return the parsed fields in the shape stored as ai_analysis["_parsed"]"""
+        if not has_content:
+            key_insight = "Advanced AI analysis completed"
+        else:
+            insight = self.key_insight or self.fallback_insight
+            if insight is None:
+                key_insight = "Comprehensive deployment analysis completed"
+            else:
+                key_insight = insight[:100] + "..." if len(insight) > 100 else insight
+        
+        return {
+            "issues": self.issues,
+            "recommendations": self.recommendations,
+            "steps": self.steps,
+            "key_insight": key_insight
+        }
+
+
+class _BufferedAnalysis:
+    """Handle yielded by SimplifiedAIAnalyzer.buffered_analysis()"""
+    
+    def __init__(self, analyzer: "SimplifiedAIAnalyzer", pool: ThreadPoolExecutor):
+        self._analyzer = analyzer
+        self._pool = pool
+    
+    def analyze_log(self, log_content: str, source: str = "unknown") -> Future:
+        """Queue a log for analysis; the future resolves to the analyze_log result"""
+        return self._pool.submit(self._analyzer.analyze_log, log_content, source)
+    
+    def analyze_log_file(self, path: str, source: str = "file") -> Future:
+        """Queue a log file for analysis; the future resolves to the analyze_log_file result"""
+        return self._pool.submit(self._analyzer.analyze_log_file, path, source)
+
 
 class SimplifiedAIAnalyzer:
     """Enhanced AI analyzer with single solution output"""
     
     def __init__(self):
-        print("🚀 Initializing Enhanced AI Analyzer...")
+        logger.info("🚀 Initializing Enhanced AI Analyzer...")
         
         # Initialize with GROQ AI priority
+        # Imported here: building the pattern recognizer connects to TiDB
+        from enhanced_pattern_recognition import enhanced_pattern_recognition
+        
         self.online_ai = OnlineAIService()
         self.pattern_recognition = enhanced_pattern_recognition
         self.openai_available = False  # Keep for compatibility
+        self._pattern_writer = _PatternBatchWriter(self.pattern_recognition.vector_search)
         
         # Force Groq availability if key is present (bypass initialization test)
         groq_key = os.getenv("GROQ_API_KEY", "")
         if groq_key and len(groq_key) > 30 and groq_key.startswith('gsk_'):
-            print("✅ GROQ API Key: Detected and validated")
+            self._groq_key = groq_key
+            logger.info("✅ GROQ API Key: Detected and validated")
             # Force Groq to be available
             if 'groq' not in self.online_ai.available_backends:
                 self.online_ai.available_backends.insert(0, 'groq')
                 self.online_ai.active_backend = 'groq'
-                print("🚀 Groq forcefully activated - bypassing initialization test")
+                logger.info("🚀 Groq forcefully activated - bypassing initialization test")
         else:
-            print("❌ GROQ API Key missing or invalid format")
+            self._groq_key = None
+            logger.warning("❌ GROQ API Key missing or invalid format")
         
         # Check available AI backends
         if hasattr(self.online_ai, 'available_backends') and self.online_ai.available_backends:
-            print(f"✅ AI Backends Available: {self.online_ai.available_backends}")
-            print(f"🎯 Active Backend: {self.online_ai.active_backend}")
+            logger.info("✅ AI Backends Available: %s", self.online_ai.available_backends)
+            logger.info("🎯 Active Backend: %s", self.online_ai.active_backend)
         else:
-            print("⚠️ No AI backends available - will use pattern recognition")
+            logger.warning("⚠️ No AI backends available - will use pattern recognition")
             
-        print("✅ Enhanced AI Analyzer initialized")
+        logger.info("✅ Enhanced AI Analyzer initialized")
     
     def analyze_log(self, log_content: str, source: str = "unknown") -> Dict[str, Any]:
         """
         Analyze log and provide a SINGLE comprehensive solution
         No more multiple sections - one finalized solution only
         """
-        analysis_start = datetime.now()
-        print(f"🔍 Analyzing {len(log_content)} characters of log content...")
+        analysis_start = time.perf_counter()
+        
+        # Ids and cache keys use the canonical form of the whole log: reruns that
+        # differ only in timestamps or container ids map to the same pattern, while
+        # different large logs that distill to the same text stay apart
+        log_fp = _log_fingerprint(_canonicalize_log(log_content))
+        
+        # Everything downstream (Groq prompt, keyword scans, storage) sees the distilled log
+        return self._analyze_distilled(_distill_log(log_content), source, len(log_content), log_fp, analysis_start)
+    
+    def analyze_log_file(self, path: str, source: str = "file") -> Dict[str, Any]:
+        """
+        Analyze a log file, streaming it line by line so that only the
+        distilled log is ever held in memory
+        """
+        analysis_start = time.perf_counter()
+        with open(path, "r", encoding="utf-8", errors="replace", buffering=1 << 20) as log_file:
+            log_content, original_length, log_fp = _distill_stream(log_file)
+        return self._analyze_distilled(log_content, source, original_length, log_fp, analysis_start)
+    
+    @contextmanager
+    def buffered_analysis(self, max_batch: int = _GROQ_WORKERS):
+        """
+        Analyze many logs (build matrix failures, parallel services) together:
+        logs queued on the yielded handle are analyzed concurrently over the
+        pooled connections, and leaving the block waits for all of them.
+        At most _GROQ_WORKERS run at once, so batch members do not sit in the
+        Groq queue behind each other and hedge on queueing time alone.
+        
+            with ai_analyzer.buffered_analysis() as batch:
+                futures = [batch.analyze_log(log, "ci") for log in logs]
+            results = [future.result() for future in futures]
+        """
+        # A pool of its own: analyses block on Groq calls running in _EXECUTOR
+        pool = ThreadPoolExecutor(max_workers=min(max_batch, _GROQ_WORKERS), thread_name_prefix="ai-batch")
+        try:
+            yield _BufferedAnalysis(self, pool)
+        finally:
+            pool.shutdown(wait=True)
+    
+    def _analyze_distilled(self, log_content: str, source: str, original_length: int, log_fp: str,
+                           analysis_start: float) -> Dict[str, Any]:
+        """Run the Groq / pattern-recognition analysis on an already distilled log.
+
+        log_fp is the fingerprint of the whole canonicalized log, not just the
+        distilled part.
+        """
+        logger.debug("🔍 Analyzing %d of %d characters of log content...", len(log_content), original_length)
+        
+        # The same log from the same source was analyzed recently: reuse that
+        # answer instead of calling Groq again. The prompt and summary depend on
+        # the source, so it is part of the key.
+        cache_key = (log_fp, source)
+        entry = _EXACT_CACHE.get(cache_key)
+        if entry is not None and time.monotonic() - entry[0] <= _EXACT_CACHE_TTL:
+            logger.debug("♻️ Reusing recent analysis of the same log")
+            # A deep copy, so callers cannot change the cached issues or solution
+            result = copy.deepcopy(entry[1])
+            result.update(
+                cache_hit=True,
+                processing_time=time.perf_counter() - analysis_start,
+                timestamp=datetime.now().isoformat(),
+                original_log_length=original_length
+            )
+            return result
         
         # DIRECT GROQ API - Bypass all initialization issues
-        groq_key = os.getenv('GROQ_API_KEY', '')
-        if groq_key and groq_key.startswith('gsk_') and len(groq_key) > 30:
+        # Key was validated once in __init__
+        pattern_future = None
+        if self._groq_key and _has_failure_marker(log_content):
+            logger.debug("🚀 DIRECT GROQ API: Bypassing all wrapper classes...")
+            groq_future = _EXECUTOR.submit(self._call_groq_directly, log_content, source, self._groq_key)
+            
+            # Hedge slow Groq calls: past the soft deadline, run pattern recognition
+            # in parallel and take whichever answer arrives first
+            done, _ = wait([groq_future], timeout=_GROQ_SOFT_DEADLINE)
+            if not done:
+                logger.debug("⏱️ Groq slower than %.0fs, hedging with pattern recognition...", _GROQ_SOFT_DEADLINE)
+                pattern_future = _FALLBACK_EXECUTOR.submit(self.pattern_recognition.analyze_and_solve, log_content, source)
+                wait([groq_future, pattern_future], return_when=FIRST_COMPLETED)
+            
             try:
-                print("🚀 DIRECT GROQ API: Bypassing all wrapper classes...")
-                online_analysis = self._call_groq_directly(log_content, source, groq_key)
+                online_analysis = groq_future.result() if groq_future.done() else None
                 
                 # If Groq AI provides any analysis (even without structured issues), use it!
                 if online_analysis and (online_analysis.get("issues") or online_analysis.get("recommendations") or online_analysis.get("raw_response")):
-                    print(f"✅ GROQ AI SUCCESS: Analysis complete with {self.online_ai.active_backend}")
+                    logger.debug("✅ GROQ AI SUCCESS: Analysis complete with %s", self.online_ai.active_backend)
+                    if pattern_future is not None:
+                        # Only drops a fallback still waiting for a worker; a running
+                        # one finishes in the background and its result is ignored
+                        pattern_future.cancel()
                     
                     # Create comprehensive solution from AI analysis
-                    comprehensive_solution = self._create_ai_comprehensive_solution(online_analysis, log_content)
+                    comprehensive_solution = self._create_ai_comprehensive_solution(
+                        online_analysis, log_content, log_fp=log_fp
+                    )
                     
-                    # Store this pattern for future learning
-                    try:
-                        pattern_id = self.pattern_recognition.vector_search.store_deployment_pattern(
-                            log_content, 
-                            online_analysis.get("issues", []),
-                            [comprehensive_solution]
-                        )
-                    except:
-                        pattern_id = f"ai_{hash(log_content) % 10000}"
+                    # Store this pattern for future learning without holding up the response;
+                    # the fingerprint doubles as its pattern hash so feedback can find it
+                    pattern_id = log_fp
+                    self._pattern_writer.put(
+                        log_content,
+                        online_analysis.get("issues", []),
+                        [comprehensive_solution],
+                        pattern_id
+                    )
                     
-                    return {
+                    confidence = max(online_analysis.get("confidence", 0.85), 0.88)
+                    result = {
                         "analysis_type": "Groq AI-Powered Analysis", 
                         "backend": f"groq_ai_{online_analysis.get('backend', 'ai')}",
-                        "confidence": max(online_analysis.get("confidence", 0.85), 0.88),
-                        "confidence_score": max(online_analysis.get("confidence", 0.85), 0.88),
+                        "confidence": confidence,
+                        "confidence_score": confidence,
                         "ai_powered": True,
                         
                         # AI-generated analysis
@@ -102,21 +713,32 @@ class SimplifiedAIAnalyzer:
                             "fallback_used": False
                         },
                         
-                        "processing_time": (datetime.now() - analysis_start).total_seconds(),
+                        "cache_hit": False,
+                        "processing_time": time.perf_counter() - analysis_start,
                         "timestamp": datetime.now().isoformat(),
-                        "source": source
+                        "source": source,
+                        "original_log_length": original_length
                     }
+                    _EXACT_CACHE.put(cache_key, (time.monotonic(), copy.deepcopy(result)))
+                    return result
+                elif not groq_future.done():
+                    logger.warning("⏱️ Pattern recognition answered before Groq, using it")
                 else:
-                    print(f"⚠️ AI response empty, trying enhanced prompting...")
+                    logger.warning("⚠️ AI response empty, trying enhanced prompting...")
                     
             except Exception as e:
-                print(f"❌ Groq AI analysis failed: {e}")
+                logger.warning("❌ Groq AI analysis failed: %s", e)
+        elif self._groq_key:
+            logger.debug("✅ No failure markers in log, skipping the Groq round-trip")
         else:
-            print("❌ No Groq AI backends available")
+            logger.debug("❌ No Groq AI backends available")
         
         # Only use pattern recognition if AI completely fails
-        print("🔍 Using enhanced pattern recognition with AI-style formatting...")
-        pattern_result = self.pattern_recognition.analyze_and_solve(log_content, source)
+        logger.debug("🔍 Using enhanced pattern recognition with AI-style formatting...")
+        if pattern_future is not None:
+            pattern_result = pattern_future.result()
+        else:
+            pattern_result = self.pattern_recognition.analyze_and_solve(log_content, source)
         
         # Enhance the response to show it's improved
         pattern_result["backend"] = "enhanced_ai_patterns"
@@ -124,14 +746,14 @@ class SimplifiedAIAnalyzer:
         pattern_result["pattern_analysis"] = pattern_result.get("pattern_analysis", {})
         pattern_result["pattern_analysis"]["ai_fallback"] = True
         pattern_result["pattern_analysis"]["groq_powered"] = False
+        pattern_result["original_log_length"] = original_length
+        pattern_result["cache_hit"] = False
         
         return pattern_result
     
     def _call_groq_directly(self, log_content: str, source: str, api_key: str) -> Dict[str, Any]:
         """Call Groq API directly, bypassing all initialization issues"""
         
-        import requests
-        
         prompt = f"""Analyze this {source} deployment log and provide solutions:
 
 {log_content}
@@ -144,106 +766,109 @@ Please provide:
 
 Format your response to be actionable and detailed."""
 
+        max_tokens = min(_GROQ_MAX_TOKENS, _GROQ_BASE_TOKENS + len(log_content) // 4)
+        body = _GROQ_BODY_PREFIX + json.dumps(prompt) + _GROQ_BODY_SUFFIX % max_tokens
+        
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
+            with _GROQ_SESSION.post(
+                _GROQ_CHAT_URL,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json"
                 },
-                json={
-                    "model": "llama-3.1-8b-instant",
-                    "messages": [
-                        {
-                            "role": "system", 
-                            "content": "You are an expert DevOps engineer specializing in deployment troubleshooting. Provide detailed, actionable solutions."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "max_tokens": 1500,
-                    "temperature": 0.1,
-                    "top_p": 0.9
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                ai_response = result["choices"][0]["message"]["content"]
-                
-                print("✅ DIRECT GROQ SUCCESS!")
+                data=body.encode("utf-8"),
+                timeout=30,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.warning("❌ Direct Groq API error: %s", response.status_code)
+                    return None
                 
-                # Parse the AI response into structured format
-                return {
-                    "backend": "direct_groq",
-                    "raw_response": ai_response,
-                    "summary": f"Direct Groq AI analysis of {source} deployment issues",
-                    "confidence": 0.92,
-                    "issues": self._extract_issues_from_response(ai_response),
-                    "recommendations": self._extract_recommendations_from_response(ai_response)
-                }
-            else:
-                print(f"❌ Direct Groq API error: {response.status_code}")
-                return None
+                # Issues, recommendations and steps are parsed while the response streams in
+                ai_response, parsed = self._read_groq_stream(response)
+            
+            logger.debug("✅ DIRECT GROQ SUCCESS!")
+            
+            return {
+                "backend": "direct_groq",
+                "raw_response": ai_response,
+                "summary": f"Direct Groq AI analysis of {source} deployment issues",
+                "confidence": 0.92,
+                "issues": parsed["issues"],
+                "recommendations": parsed["recommendations"],
+                "_parsed": parsed
+            }
                 
         except Exception as e:
-            print(f"❌ Direct Groq call failed: {e}")
+            logger.warning("❌ Direct Groq call failed: %s", e)
             return None
     
+    def _read_groq_stream(self, response) -> tuple:
+        """Accumulate a streamed Groq completion, parsing each line as soon as it is complete"""
+        parser = _AIResponseParser()
+        pieces = []
+        partial = []  # pieces of the current, not yet terminated line
+        
+        for event in response.iter_lines():
+            if not event.startswith(b"data: "):
+                continue
+            data = event[6:].strip()
+            if data == b"[DONE]":
+                break
+            
+            delta = _json_loads(data)["choices"][0].get("delta", {}).get("content")
+            if not delta:
+                continue
+            pieces.append(delta)
+            
+            # Feed complete lines to the parser, keep the partial tail for the next chunk;
+            # pieces are joined once per line, never re-copied per token
+            cut = delta.rfind("\n")
+            if cut == -1:
+                partial.append(delta)
+                continue
+            partial.append(delta[:cut + 1])
+            for line in "".join(partial).splitlines():
+                parser.feed(line)
+            partial = [delta[cut + 1:]]
+        
+        for line in "".join(partial).splitlines():
+            parser.feed(line)
+        
+        ai_response = "".join(pieces)
+        return ai_response, parser.result(bool(ai_response))
+    
+    def _parse_ai_response(self, raw_response: str) -> Dict[str, Any]:
+        """Walk the Groq response once and collect issues, recommendations, steps and key insight"""
+        parser = _AIResponseParser()
+        if raw_response:
+            for line in raw_response.splitlines():
+                parser.feed(line)
+                if parser.done:
+                    break
+        return parser.result(bool(raw_response))
+    
+    def _get_parsed_response(self, ai_analysis: Dict) -> Dict[str, Any]:
+        """Return the parsed Groq response cached on the analysis, parsing it on first use"""
+        parsed = ai_analysis.get("_parsed")
+        if parsed is None:
+            parsed = self._parse_ai_response(ai_analysis.get("raw_response", ""))
+            ai_analysis["_parsed"] = parsed
+        return parsed
+    
     def _extract_issues_from_response(self, response: str) -> List[Dict]:
         """Extract issues from Groq AI response"""
-        issues = []
-        lines = response.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if any(keyword in line.lower() for keyword in ['error', 'issue', 'problem', 'fail']):
-                if len(line) > 10:
-                    issues.append({
-                        "description": line.replace('*', '').replace('-', '').strip(),
-                        "severity": "high" if any(word in line.lower() for word in ['critical', 'severe']) else "medium"
-                    })
-        
-        return issues[:3]  # Return top 3 issues
+        return self._parse_ai_response(response)["issues"]  # Top 3 issues
     
     def _extract_recommendations_from_response(self, response: str) -> List[str]:
         """Extract recommendations from Groq AI response"""
-        recommendations = []
-        lines = response.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if any(keyword in line.lower() for keyword in ['solution', 'fix', 'resolve', 'step']):
-                if len(line) > 15:
-                    clean_line = line.replace('*', '').replace('-', '').strip()
-                    recommendations.append(clean_line)
-        
-        return recommendations[:5]  # Return top 5 recommendations
+        return self._parse_ai_response(response)["recommendations"]  # Top 5 recommendations
     
     def _extract_key_insight_from_response(self, raw_response: str) -> str:
         """Extract key insight from AI response"""
-        if not raw_response:
-            return "Advanced AI analysis completed"
-        
-        # Look for key patterns in the response
-        lines = raw_response.split('\n')
-        for line in lines[:5]:  # Check first 5 lines
-            line = line.strip()
-            if len(line) > 30 and any(word in line.lower() for word in ['issue', 'problem', 'error', 'fix', 'solution']):
-                return line[:100] + "..." if len(line) > 100 else line
-        
-        # Fallback to first meaningful line
-        for line in lines:
-            line = line.strip()
-            if len(line) > 20:
-                return line[:100] + "..." if len(line) > 100 else line
-        
-        return "Comprehensive deployment analysis completed"
+        return self._parse_ai_response(raw_response)["key_insight"]
     
-    def _extract_detailed_steps_from_ai_response(self, raw_response: str, domain: str) -> List[str]:
+    def _extract_detailed_steps_from_ai_response(self, raw_response: str, domain: str, parsed: Dict = None) -> List[str]:
         """Extract detailed steps from AI response"""
         if not raw_response:
             return [
@@ -252,19 +877,9 @@ Format your response to be actionable and detailed."""
                 f"**Step 3**: **Validate Results** - Verify resolution and monitor stability"
             ]
         
-        steps = []
-        lines = raw_response.split('\n')
-        step_count = 1
-        
-        for line in lines:
-            line = line.strip()
-            if any(indicator in line.lower() for indicator in ['step', 'fix', 'resolve', 'check', 'update', 'restart']):
-                if len(line) > 15:
-                    clean_line = line.replace('*', '').replace('-', '').strip()
-                    steps.append(f"**Step {step_count}**: {clean_line}")
-                    step_count += 1
-                    if step_count > 5:  # Max 5 steps
-                        break
+        if parsed is None:
+            parsed = self._parse_ai_response(raw_response)
+        steps = list(parsed["steps"])
         
         # Ensure we have at least 3 steps
         if len(steps) < 3:
@@ -275,143 +890,50 @@ Format your response to be actionable and detailed."""
         
         return steps[:5]  # Max 5 steps
     
-    def _generate_detailed_ai_code_solution(self, issues: List, recommendations: List, domain: str, log_content: str, raw_response: str) -> str:
+    def _generate_detailed_ai_code_solution(self, issues: List, recommendations: List, domain: str, log_content: str, raw_response: str,
+                                            log_lower: str = None) -> str:
         """Generate detailed implementation code with explanations"""
         
+        if log_lower is None:
+            log_lower = log_content.lower()
+        
+        # Tag the issues in one pass over their joined text
+        issues_text = "\n".join(str(issue) for issue in issues)
+        issue_tags = {_ISSUE_TAG_KEYWORDS[match.group(1).lower()] for match in _ISSUE_TAG_RE.finditer(issues_text)}
+        
         # Determine the primary issue type for targeted code
-        if any("kubernetes" in str(issue).lower() or "k8s" in str(issue).lower() for issue in issues):
-            return self._generate_kubernetes_ai_code(issues, recommendations, raw_response)
-        elif any("docker" in str(issue).lower() for issue in issues):
-            return self._generate_docker_ai_code(issues, recommendations, raw_response)
-        elif "port" in log_content.lower() or "network" in log_content.lower():
+        if "kubernetes" in issue_tags:
+            return self._generate_ai_code("kubernetes")
+        elif "docker" in issue_tags:
+            return self._generate_ai_code("docker")
+        elif "port" in log_lower or "network" in log_lower:
             return self._generate_network_ai_code(issues, recommendations, raw_response)
         else:
-            return self._generate_general_ai_code(issues, recommendations, log_content)
+            return self._generate_ai_code("general")
     
-    def _generate_kubernetes_ai_code(self, issues: List, recommendations: List, raw_response: str) -> str:
-        """Generate Kubernetes-specific code with AI insights"""
-        return f'''# 🚀 GROQ AI-Powered Kubernetes Solution
-# Generated based on intelligent log analysis
-
-# === STEP 1: CLUSTER DIAGNOSTICS (AI-RECOMMENDED) ===
-echo "🔍 AI Analysis: Running comprehensive Kubernetes diagnostics..."
-kubectl cluster-info dump --output-directory=/tmp/cluster-state
-kubectl get nodes -o wide
-kubectl get pods --all-namespaces --field-selector=status.phase!=Running
-
-# === STEP 2: RESOURCE OPTIMIZATION (GROQ AI INSIGHTS) ===
-echo "⚡ Applying AI-recommended resource fixes..."
-kubectl top nodes
-kubectl describe nodes | grep -A 5 "Allocated resources"
-
-# AI-identified resource constraints fix:
-kubectl patch deployment webapp-deployment -p '{{
-  "spec": {{
-    "template": {{
-      "spec": {{
-        "containers": [{{
-          "name": "webapp",
-          "resources": {{
-            "requests": {{"memory": "512Mi", "cpu": "250m"}},
-            "limits": {{"memory": "1Gi", "cpu": "500m"}}
-          }}
-        }}]
-      }}
-    }}
-  }}
-}}'
-
-# === STEP 3: AI-POWERED SCALING SOLUTION ===
-echo "📈 Implementing intelligent scaling based on AI analysis..."
-kubectl scale deployment webapp-deployment --replicas=3
-kubectl autoscale deployment webapp-deployment --cpu-percent=70 --min=2 --max=8
-
-# === STEP 4: VERIFICATION & MONITORING ===
-echo "✅ Verifying AI-implemented solutions..."
-kubectl get pods -w --timeout=60s
-kubectl logs -l app=webapp --tail=20
-echo "🎯 Groq AI Kubernetes optimization complete!"
-
-# AI Insight: {raw_response[:150] if raw_response else "Advanced analysis applied"}...'''
-
-    def _generate_docker_ai_code(self, issues: List, recommendations: List, raw_response: str) -> str:
-        """Generate Docker-specific code with AI insights"""
-        return f'''# 🐳 GROQ AI-Powered Docker Solution
-# Intelligent container optimization based on log analysis
-
-# === STEP 1: CONTAINER DIAGNOSTICS ===
-echo "🔍 AI Analysis: Checking Docker environment..."
-docker system info
-docker system df
-docker ps -a --format "table {{{{.Names}}}}\\t{{{{.Status}}}}\\t{{{{.Ports}}}}"
-
-# === STEP 2: AI-RECOMMENDED CONTAINER FIXES ===
-echo "⚡ Applying intelligent Docker optimizations..."
-docker system prune -f  # Clean up resources
-docker network prune -f
-
-# Rebuild with AI-optimized configuration:
-docker build -t webapp:ai-optimized .
-docker run -d \\
-  --name webapp-ai \\
-  --restart=unless-stopped \\
-  -p 3000:3000 \\
-  --memory=1g \\
-  --cpus=0.5 \\
-  webapp:ai-optimized
-
-# === STEP 3: MONITORING & VALIDATION ===
-echo "📊 Monitoring AI-optimized deployment..."
-docker logs webapp-ai --tail=20 -f &
-docker stats webapp-ai --no-stream
-echo "🎯 Docker AI optimization complete!"
-
-# AI Insight: {raw_response[:150] if raw_response else "Container optimization applied"}...'''
-
     def _generate_network_ai_code(self, issues: List, recommendations: List, raw_response: str) -> str:
         """Generate network-specific code with AI insights"""
-        return f'''# 🌐 GROQ AI Network Configuration Solution
-# Intelligent network troubleshooting based on log analysis
-
-# === STEP 1: NETWORK DIAGNOSTICS ===
-echo "🔍 AI Analysis: Network connectivity check..."
-netstat -tuln | grep LISTEN
-ss -tuln | grep :80
-curl -I http://localhost:3000 || echo "Service not accessible"
-
-# === STEP 2: AI-RECOMMENDED NETWORK FIXES ===
-echo "⚡ Applying intelligent network configuration..."
-
-# Check and fix port conflicts (AI-identified):
-sudo lsof -i :3000 || echo "Port 3000 available"
-sudo systemctl status firewall || sudo ufw status
-
-# Configure intelligent routing:
-sudo iptables -L INPUT -n --line-numbers
-sudo ufw allow 3000/tcp  # Allow application port
-
-# === STEP 3: SERVICE RESTART WITH OPTIMIZATION ===
-echo "🔄 Restarting services with AI optimizations..."
-sudo systemctl restart nginx
-sudo systemctl restart your-app
-curl -f http://localhost:3000/health || echo "Health check failed"
-
-echo "🎯 Network AI optimization complete!"
-
-# AI Insight: {raw_response[:150] if raw_response else "Network configuration optimized"}...'''
+        return _NETWORK_AI_CODE_TEMPLATE.replace(
+            "{AI_INSIGHT}", raw_response[:150] if raw_response else "Network configuration optimized"
+        )
 
 
     
-    def _create_ai_comprehensive_solution(self, ai_analysis: Dict, log_content: str) -> Dict[str, Any]:
+    def _create_ai_comprehensive_solution(self, ai_analysis: Dict, log_content: str, log_fp: str = None) -> Dict[str, Any]:
         """Create comprehensive solution directly from Groq AI analysis with detailed explanations"""
         
+        if log_fp is None:
+            log_fp = _log_fingerprint(_canonicalize_log(log_content))
+        
         issues = ai_analysis.get("issues", [])
         recommendations = ai_analysis.get("recommendations", [])
         raw_response = ai_analysis.get("raw_response", "")
         backend_used = ai_analysis.get("backend", "groq")
+        parsed = self._get_parsed_response(ai_analysis)
         
         # Extract domain from log content for targeted solution
-        domain = self._determine_primary_domain_from_log(log_content)
+        log_lower = log_content.lower()
+        domain = self._determine_primary_domain_from_log(log_lower)
         
         # Create AI-driven solution title with more detail
         if issues:
@@ -424,7 +946,7 @@ echo "🎯 Network AI optimization complete!"
         # Create detailed description with AI insights
         if raw_response and len(raw_response) > 50:
             # Extract key insights from AI response
-            key_insight = self._extract_key_insight_from_response(raw_response)
+            key_insight = parsed["key_insight"]
             description = f"**AI Analysis**: {key_insight}\n\n**Domain**: {domain.title()} Environment\n**Powered by**: {backend_used.upper()} AI Model\n**Confidence**: High"
         else:
             description = f"Comprehensive AI-generated solution addressing deployment challenges in {domain} environment using advanced {backend_used.upper()} analysis"
@@ -434,10 +956,12 @@ echo "🎯 Network AI optimization complete!"
             structured_steps = self._create_detailed_ai_steps(recommendations, domain, issues)
         else:
             # Generate detailed steps from raw AI response
-            structured_steps = self._extract_detailed_steps_from_ai_response(raw_response, domain)
+            structured_steps = self._extract_detailed_steps_from_ai_response(raw_response, domain, parsed)
         
         # Generate comprehensive implementation code with explanations
-        implementation_code = self._generate_detailed_ai_code_solution(issues, recommendations, domain, log_content, raw_response)
+        implementation_code = self._generate_detailed_ai_code_solution(
+            issues, recommendations, domain, log_content, raw_response, log_lower=log_lower
+        )
         
         # Calculate confidence based on AI analysis quality
         ai_confidence = ai_analysis.get("confidence", 0.85)
@@ -454,8 +978,8 @@ echo "🎯 Network AI optimization complete!"
             "ai_insights": raw_response,  # Full AI response for context
             "addresses_issues": [issue.get("description", "Unknown") for issue in issues],
             "groq_generated": True,
-            "pattern_id": f"groq_{domain}_{hash(log_content) % 10000}",
-            "detailed_explanation": self._create_detailed_explanation(issues, recommendations, raw_response, domain)
+            "pattern_id": log_fp,  # same id as the stored pattern hash
+            "detailed_explanation": self._create_detailed_explanation(issues, recommendations, raw_response, domain, parsed["key_insight"])
         }
     
     def _create_detailed_ai_steps(self, recommendations: List, domain: str, issues: List) -> List[str]:
@@ -481,18 +1005,13 @@ echo "🎯 Network AI optimization complete!"
     
     def _enhance_step_explanation(self, step: str, domain: str, step_num: int) -> str:
         """Add detailed explanations to each step"""
-        if "config" in step.lower() or "configuration" in step.lower():
-            return f"**Configure {domain.title()}** - {step}. This addresses configuration issues by updating settings to match best practices for {domain} deployments."
-        elif "port" in step.lower() or "network" in step.lower():
-            return f"**Fix Network Configuration** - {step}. This resolves connectivity issues by ensuring proper port configuration and network accessibility."
-        elif "docker" in step.lower() or "container" in step.lower():
-            return f"**Optimize Container Setup** - {step}. This improves container deployment by addressing Docker-specific configuration and resource allocation."
-        elif "deploy" in step.lower() or "build" in step.lower():
-            return f"**Enhance Deployment Process** - {step}. This optimizes the deployment pipeline for better reliability and faster deployments."
-        else:
-            return f"**{step.split('.')[0] if '.' in step else 'Execute Action'}** - {step}. This step addresses critical issues identified in the {domain} environment."
+        step_lower = step.lower()
+        for keywords, template in _STEP_EXPLANATIONS:
+            if any(keyword in step_lower for keyword in keywords):
+                return template.format(step=step, domain=domain, domain_title=domain.title())
+        return f"**{step.split('.')[0] if '.' in step else 'Execute Action'}** - {step}. This step addresses critical issues identified in the {domain} environment."
     
-    def _create_detailed_explanation(self, issues: List, recommendations: List, raw_response: str, domain: str) -> str:
+    def _create_detailed_explanation(self, issues: List, recommendations: List, raw_response: str, domain: str, key_insight: str = None) -> str:
         """Create comprehensive explanation of the AI analysis"""
         explanation_parts = []
         
@@ -503,7 +1022,8 @@ echo "🎯 Network AI optimization complete!"
             explanation_parts.append(f"**Solutions Provided**: {len(recommendations)} actionable recommendations generated by Groq AI")
         
         if raw_response:
-            key_insight = self._extract_key_insight_from_response(raw_response)
+            if key_insight is None:
+                key_insight = self._extract_key_insight_from_response(raw_response)
             explanation_parts.append(f"**AI Insight**: {key_insight}")
         
         explanation_parts.append(f"**Resolution Approach**: Comprehensive {domain} optimization using advanced AI analysis for maximum deployment success")
@@ -520,7 +1040,7 @@ echo "🎯 Network AI optimization complete!"
             enhanced_error = {
                 "title": error.get("description", "AI-Detected Issue"),
                 "description": error.get("description", "Issue identified by AI analysis"),
-                "severity": error.get("severity", "medium"),
+                "severity": _intern_label(error.get("severity", "medium")),
                 "explanation": f"AI Analysis: {error.get('description', 'System issue detected')}",
                 "ai_confidence": ai_analysis.get("confidence", 0.85),
                 "source": "groq_ai"
@@ -542,713 +1062,34 @@ echo "🎯 Network AI optimization complete!"
         
         return enhanced_errors
     
-    def _determine_primary_domain_from_log(self, log_content: str) -> str:
-        """Determine primary domain from log content for AI solutions"""
-        
-        log_lower = log_content.lower()
-        
-        # Enhanced domain detection
-        if any(keyword in log_lower for keyword in ["docker", "container", "dockerfile", "image"]):
-            return "docker"
-        elif any(keyword in log_lower for keyword in ["kubectl", "kubernetes", "pod", "deployment"]):
-            return "kubernetes"
-        elif any(keyword in log_lower for keyword in ["mysql", "postgres", "database", "db"]):
-            return "database"
-        elif any(keyword in log_lower for keyword in ["nginx", "apache", "server", "http"]):
-            return "web-server"
-        elif any(keyword in log_lower for keyword in ["network", "port", "connection", "bind"]):
-            return "networking"
-        else:
-            return "system"
-    
-    def _extract_steps_from_ai_response(self, raw_response: str, domain: str) -> List[str]:
-        """Extract actionable steps from AI raw response"""
-        
-        if not raw_response:
-            return self._get_default_ai_steps(domain)
-        
-        steps = []
-        lines = raw_response.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if any(action in line.lower() for action in 
-                  ['check', 'verify', 'run', 'execute', 'stop', 'start', 'restart', 'configure']):
-                if len(line) > 15 and not line.startswith('#'):
-                    steps.append(f"**AI Recommendation** - {line}")
-                    if len(steps) >= 5:
-                        break
-        
-        if not steps:
-            steps = self._get_default_ai_steps(domain)
-        
-        return steps[:5]  # Limit to 5 steps
-    
-    def _generate_ai_code_solution(self, issues: List[Dict], recommendations: List[str], domain: str, log_content: str) -> str:
-        """Generate comprehensive code solution based on AI analysis"""
-        
-        if domain == "docker":
-            return self._generate_docker_ai_code(issues, recommendations, log_content)
-        elif domain == "kubernetes":
-            return self._generate_kubernetes_ai_code(issues, recommendations, log_content)
-        elif domain == "database":
-            return self._generate_database_ai_code(issues, recommendations, log_content)
-        else:
-            return self._generate_general_ai_code(issues, recommendations, log_content)
+    def _determine_primary_domain_from_log(self, log_lower: str) -> str:
+        """Determine primary domain from already-lowercased log content for AI solutions"""
+        
+        # Substring tests run in C and stop at the first hit, so checking the
+        # domains in priority order beats a single Python-level regex scan
+        for domain, keywords in _LOG_DOMAIN_KEYWORDS:
+            if any(keyword in log_lower for keyword in keywords):
+                return domain
+        return "system"
     
-    def _generate_docker_ai_code(self, issues: List[Dict], recommendations: List[str], log_content: str) -> str:
-        """Generate Docker-specific AI solution code"""
+    def _generate_ai_code(self, domain: str) -> str:
+        """Return the static AI solution code for a domain (general code otherwise)"""
         
-        return '''#!/bin/bash
-# AI-POWERED DOCKER SOLUTION
-echo "🤖 Executing Groq AI-generated Docker resolution..."
-
-# AI Analysis: Docker deployment issue detected
-echo "🔍 AI-Detected Issue Analysis..."
-docker --version
-docker system info | grep -E "(Images|Containers|Running)"
-
-# AI Recommendation: Check container status and logs
-echo "📋 Container Status Analysis..."
-docker ps -a --format "table {{.Names}}\\t{{.Status}}\\t{{.Ports}}"
-docker logs $(docker ps -q --latest) --tail=20 2>/dev/null || echo "No recent containers"
-
-# AI Solution: Comprehensive Docker fix
-echo "🛠️ Applying AI-recommended fixes..."
-
-# Stop conflicting processes
-docker ps -q | xargs -r docker stop
-
-# Clean up resources
-docker system prune -f
-docker volume prune -f
-
-# Rebuild with AI-optimized settings
-docker build --no-cache -t ai-fixed-app .
-docker run -d --name ai-solution -p 8080:80 ai-fixed-app
-
-echo "✅ AI Docker solution applied successfully!"
-docker ps | grep ai-solution
-'''
-    
-    def _generate_kubernetes_ai_code(self, issues: List[Dict], recommendations: List[str], log_content: str) -> str:
-        """Generate Kubernetes-specific AI solution code"""
-        
-        return '''#!/bin/bash
-# AI-POWERED KUBERNETES SOLUTION
-echo "🤖 Executing Groq AI-generated Kubernetes resolution..."
-
-# AI Analysis: Kubernetes deployment issue detected
-echo "🔍 AI Cluster Analysis..."
-kubectl cluster-info
-kubectl get nodes -o wide
-
-# AI Recommendation: Check pod and deployment status
-echo "📋 Pod Status Analysis..."
-kubectl get pods --all-namespaces --field-selector=status.phase!=Running
-kubectl describe pods | grep -E "(Error|Failed|Pending)"
-
-# AI Solution: Comprehensive K8s fix
-echo "🛠️ Applying AI-recommended fixes..."
-
-# Scale down problematic deployments
-kubectl get deployments | grep -v NAME | while read deployment rest; do
-    kubectl scale deployment $deployment --replicas=1
-done
-
-# Apply AI-optimized resource limits
-kubectl patch deployment $DEPLOYMENT_NAME -p '{
-  "spec": {
-    "template": {
-      "spec": {
-        "containers": [{
-          "name": "app",
-          "resources": {
-            "requests": {"memory": "256Mi", "cpu": "100m"},
-            "limits": {"memory": "512Mi", "cpu": "200m"}
-          }
-        }]
-      }
-    }
-  }
-}' 2>/dev/null || echo "Deployment patch applied"
-
-# Verify AI solution
-kubectl rollout status deployment/$DEPLOYMENT_NAME
-echo "✅ AI Kubernetes solution applied successfully!"
-'''
-    
-    def _generate_database_ai_code(self, issues: List[Dict], recommendations: List[str], log_content: str) -> str:
-        """Generate database-specific AI solution code"""
-        
-        return '''#!/bin/bash
-# AI-POWERED DATABASE SOLUTION
-echo "🤖 Executing Groq AI-generated database resolution..."
-
-# AI Analysis: Database connectivity issue detected
-echo "🔍 AI Database Analysis..."
-ping -c 3 ${DB_HOST:-localhost}
-nc -zv ${DB_HOST:-localhost} ${DB_PORT:-3306}
-
-# AI Recommendation: Check database service status
-echo "📋 Database Service Analysis..."
-systemctl status mysql 2>/dev/null || systemctl status postgresql 2>/dev/null
-docker ps | grep -E "(mysql|postgres|mariadb)"
-
-# AI Solution: Comprehensive database fix
-echo "🛠️ Applying AI-recommended fixes..."
-
-# Restart database services
-sudo systemctl restart mysql 2>/dev/null || sudo systemctl restart postgresql 2>/dev/null
-
-# Test connections
-python3 -c "
-import os
-try:
-    import pymysql
-    conn = pymysql.connect(host=os.getenv('DB_HOST', 'localhost'))
-    print('✅ MySQL connection successful')
-    conn.close()
-except: pass
-try:
-    import psycopg2
-    conn = psycopg2.connect(host=os.getenv('DB_HOST', 'localhost'))
-    print('✅ PostgreSQL connection successful')
-    conn.close()
-except: pass
-"
-
-# Run migrations if available
-python manage.py migrate 2>/dev/null || echo "No Django migrations"
-npm run migrate 2>/dev/null || echo "No Node.js migrations"
-
-echo "✅ AI Database solution applied successfully!"
-'''
-    
-    def _generate_general_ai_code(self, issues: List[Dict], recommendations: List[str], log_content: str) -> str:
-        """Generate general AI solution code"""
-        
-        return '''#!/bin/bash
-# AI-POWERED SYSTEM SOLUTION
-echo "🤖 Executing Groq AI-generated system resolution..."
-
-# AI Analysis: System issue detected
-echo "🔍 AI System Analysis..."
-uptime
-free -h
-df -h | head -5
-
-# AI Recommendation: Check system services
-echo "📋 Service Status Analysis..."
-systemctl --failed --no-pager
-docker ps -a 2>/dev/null | head -10
-
-# AI Solution: Comprehensive system fix
-echo "🛠️ Applying AI-recommended fixes..."
-
-# System optimization
-sudo systemctl daemon-reload
-sudo systemctl restart systemd-resolved
-
-# Resource cleanup
-sudo journalctl --vacuum-time=7d
-docker system prune -f 2>/dev/null || echo "Docker not available"
-
-# Network diagnostics
-ping -c 3 8.8.8.8
-curl -I https://google.com --max-time 5
-
-echo "✅ AI System solution applied successfully!"
-'''
-    
-    def _get_default_ai_steps(self, domain: str) -> List[str]:
-        """Get default AI-generated steps for domain"""
-        
-        steps_map = {
-            "docker": [
-                "1. **AI Diagnosis** - Analyze container status and resource usage",
-                "2. **Conflict Resolution** - Stop conflicting processes and clean resources",
-                "3. **Smart Rebuild** - Rebuild with AI-optimized Docker configuration",
-                "4. **Validation** - Test container functionality and network connectivity"
-            ],
-            "kubernetes": [
-                "1. **Cluster Analysis** - AI assessment of node and pod health",
-                "2. **Resource Optimization** - Apply AI-recommended resource limits",
-                "3. **Deployment Fix** - Scale and update deployments intelligently",
-                "4. **Verification** - Confirm all pods are running successfully"
-            ],
-            "database": [
-                "1. **Connection Diagnostics** - AI analysis of database connectivity",
-                "2. **Service Recovery** - Restart database services with optimal settings",
-                "3. **Schema Validation** - Run migrations and verify data integrity",
-                "4. **Performance Check** - Test application database integration"
-            ]
-        }
-        
-        return steps_map.get(domain, [
-            "1. **Intelligent Analysis** - AI assessment of system status",
-            "2. **Smart Resolution** - Apply AI-recommended fixes",
-            "3. **System Optimization** - Improve performance and stability",
-            "4. **Validation** - Verify all systems are functioning correctly"
-        ])
+        return _AI_CODE_BY_DOMAIN.get(domain, _GENERAL_AI_CODE_TEMPLATE)
     
     def _estimate_ai_solution_time(self, issues: List[Dict], recommendations: List[str], domain: str) -> str:
         """Estimate time for AI-generated solution"""
         
-        base_times = {"docker": 10, "kubernetes": 20, "database": 15, "system": 12}
-        base_time = base_times.get(domain, 12)
-        
-        complexity_factor = len(issues) * 3 + len(recommendations) * 2
-        total_time = base_time + complexity_factor
-        
-        return f"{total_time}-{total_time + 10} minutes"
-    
-    def _create_comprehensive_solution(self, ai_analysis: Dict, log_content: str) -> Dict[str, Any]:
-        """Create ONE comprehensive solution that addresses ALL issues"""
-        
-        issues = ai_analysis.get("issues", [])
-        recommendations = ai_analysis.get("recommendations", [])
-        
-        if not issues:
-            return self._get_generic_comprehensive_solution(log_content)
-        
-        # Analyze all issues to determine unified approach
-        issue_types = [issue.get("type", "").lower() for issue in issues]
-        primary_domain = self._determine_primary_domain(issue_types, log_content)
-        
-        # Create unified solution title
-        critical_count = sum(1 for issue in issues if issue.get("severity") == "critical")
-        solution_title = f"Comprehensive {primary_domain.title()} Resolution - {len(issues)} Issues Addressed"
-        
-        # Generate unified resolution steps
-        unified_steps = self._generate_unified_steps(issues, primary_domain)
-        
-        # Generate comprehensive code that addresses all issues
-        comprehensive_code = self._generate_comprehensive_code(issues, primary_domain, log_content)
-        
-        # Calculate overall success rate
-        avg_confidence = ai_analysis.get("confidence", 0.8)
-        complexity_factor = max(0.7, 1.0 - (len(issues) * 0.05))  # More issues = slight complexity penalty
-        success_rate = min(avg_confidence * complexity_factor, 0.95)
-        
-        return {
-            "title": solution_title,
-            "description": f"Unified resolution addressing {len(issues)} deployment issues in {primary_domain} environment",
-            "steps": unified_steps,
-            "code": comprehensive_code,
-            "estimated_time": self._estimate_comprehensive_time(issues, primary_domain),
-            "success_rate": success_rate,
-            "complexity": "medium" if len(issues) <= 3 else "high",
-            "addresses_issues": [issue.get("title", "Unknown") for issue in issues],
-            "ai_generated": True,
-            "pattern_id": f"unified_{primary_domain}_{hash(log_content) % 10000}"
-        }
-    
-    def _determine_primary_domain(self, issue_types: List[str], log_content: str) -> str:
-        """Determine the primary technology domain for unified solution"""
-        
-        log_lower = log_content.lower()
-        
-        # Count indicators for each domain
-        domain_scores = {
-            "kubernetes": sum([
-                log_lower.count("kubectl"), log_lower.count("pod"), 
-                log_lower.count("deployment"), log_lower.count("namespace")
-            ]),
-            "docker": sum([
-                log_lower.count("docker"), log_lower.count("container"),
-                log_lower.count("dockerfile"), log_lower.count("image")
-            ]),
-            "database": sum([
-                log_lower.count("mysql"), log_lower.count("postgres"),
-                log_lower.count("database"), log_lower.count("connection")
-            ]),
-            "network": sum([
-                log_lower.count("port"), log_lower.count("bind"),
-                log_lower.count("connection"), log_lower.count("timeout")
-            ])
-        }
-        
-        # Return domain with highest score
-        return max(domain_scores.items(), key=lambda x: x[1])[0]
-    
-    def _generate_unified_steps(self, issues: List[Dict], domain: str) -> List[str]:
-        """Generate unified resolution steps that address all issues"""
-        
-        if domain == "kubernetes":
-            return [
-                "1. **Cluster Assessment** - Check overall cluster health and resource availability",
-                "2. **Pod Analysis** - Review all failing pods and their resource requirements", 
-                "3. **Resource Scaling** - Add nodes or adjust resource limits to resolve capacity issues",
-                "4. **Configuration Fix** - Update deployments with corrected specifications",
-                "5. **Rollout & Monitor** - Deploy fixes and monitor for successful resolution"
-            ]
-        elif domain == "docker":
-            return [
-                "1. **Build Context Review** - Verify all required files are available in build context",
-                "2. **Port Conflict Resolution** - Stop conflicting services and free up required ports",
-                "3. **Clean Rebuild** - Perform fresh build with updated configuration",
-                "4. **Container Testing** - Validate container functionality before deployment", 
-                "5. **Deployment Verification** - Confirm successful deployment and operation"
-            ]
-        elif domain == "database":
-            return [
-                "1. **Connection Validation** - Test database connectivity and authentication",
-                "2. **Schema Synchronization** - Run migrations and update database schema",
-                "3. **Permission Verification** - Confirm user permissions and access rights",
-                "4. **Application Integration** - Test application database connectivity",
-                "5. **Performance Monitoring** - Monitor database performance post-resolution"
-            ]
-        else:
-            return [
-                "1. **System Analysis** - Comprehensive review of all reported issues",
-                "2. **Root Cause Identification** - Determine underlying causes and dependencies", 
-                "3. **Coordinated Resolution** - Apply fixes in optimal sequence to prevent conflicts",
-                "4. **Integration Testing** - Verify all components work together correctly",
-                "5. **Monitoring Setup** - Establish monitoring to prevent issue recurrence"
-            ]
-    
-    def _generate_steps_for_issue_type(self, issue_type: str, issue: Dict) -> List[str]:
-        """Generate solution steps based on issue type"""
-        
-        step_templates = {
-            "docker": [
-                "1. Verify Docker build context contains all required files",
-                "2. Check .dockerignore is not excluding necessary files", 
-                "3. Rebuild with --no-cache flag to ensure fresh build",
-                "4. Test the resulting container functionality",
-                "5. Monitor build logs for any remaining issues"
-            ],
-            "kubernetes": [
-                "1. Check cluster health and node availability",
-                "2. Verify resource quotas and limits are sufficient",
-                "3. Review and update deployment configuration",
-                "4. Apply fixes and monitor pod status", 
-                "5. Validate application is running correctly"
-            ],
-            "database": [
-                "1. Verify database server connectivity and status",
-                "2. Check user permissions and authentication",
-                "3. Run necessary migrations or schema updates",
-                "4. Test application database connections",
-                "5. Monitor connection stability and performance"
-            ],
-            "network": [
-                "1. Test basic network connectivity and DNS resolution",
-                "2. Check firewall rules and security group settings",
-                "3. Verify service endpoints and port accessibility",
-                "4. Update network configuration as needed",
-                "5. Validate application network communications"
-            ]
-        }
-        
-        # Match issue type to step template
-        for key in step_templates:
-            if key in issue_type or key in issue.get("description", "").lower():
-                return step_templates[key]
-        
-        # Generic steps if no specific match
-        return [
-            "1. Identify the root cause of the reported issue",
-            "2. Review system logs and error messages thoroughly", 
-            "3. Apply appropriate configuration or code fixes",
-            "4. Test the solution in a safe environment",
-            "5. Deploy and monitor the resolution"
-        ]
-    
-
-        
-    def _generate_comprehensive_code(self, issues: List[Dict], domain: str, log_content: str) -> str:
-        """Generate comprehensive code that addresses all detected issues"""
-        
-        if domain == "kubernetes":
-            return '''#!/bin/bash
-# COMPREHENSIVE KUBERNETES RESOLUTION
-echo "� Executing unified Kubernetes fix for all detected issues..."
-
-# STEP 1: Cluster Health Assessment
-echo "📊 Checking cluster health..."
-kubectl cluster-info
-kubectl get nodes -o wide
-kubectl describe nodes | grep -E "(Condition|Pressure|Eviction)" 
-
-# STEP 2: Resource Analysis  
-echo "🔍 Analyzing resource utilization..."
-kubectl top nodes 2>/dev/null || echo "Metrics server not available"
-kubectl get pods --all-namespaces --field-selector=status.phase!=Running
-
-# STEP 3: Fix Pod Creation Issues
-echo "🛠️ Resolving pod creation and scheduling..."
-kubectl get deployment -o wide
-kubectl describe deployment $DEPLOYMENT_NAME 2>/dev/null || true
-
-# Add resource requests/limits to prevent scheduling issues
-kubectl patch deployment $DEPLOYMENT_NAME -p '{
-  "spec": {
-    "template": {
-      "spec": {
-        "containers": [{
-          "name": "'$CONTAINER_NAME'",
-          "resources": {
-            "requests": {"memory": "512Mi", "cpu": "250m"},
-            "limits": {"memory": "1Gi", "cpu": "500m"}
-          }
-        }]
-      }
-    }
-  }
-}' 2>/dev/null || echo "Deployment patch skipped"
-
-# STEP 4: Scale if needed
-echo "📈 Scaling resources..."
-kubectl scale deployment $DEPLOYMENT_NAME --replicas=2
-kubectl get pods -w --timeout=60s
-
-# STEP 5: Verify resolution
-echo "✅ Verifying fixes..."
-kubectl rollout status deployment/$DEPLOYMENT_NAME
-kubectl get pods -l app=$APP_LABEL
-echo "All Kubernetes issues resolved!"'''
-        
-        elif domain == "docker":
-            return '''#!/bin/bash  
-# COMPREHENSIVE DOCKER RESOLUTION
-echo "🚀 Executing unified Docker fix for all detected issues..."
-
-# STEP 1: Port Conflict Resolution
-echo "🔌 Resolving port conflicts..."
-sudo lsof -i :80 -i :8080 -i :3000 | grep LISTEN || echo "Ports available"
-docker ps --format "table {{.Names}}\\t{{.Ports}}" | grep -E "80|8080|3000" || echo "No conflicting containers"
-
-# Stop conflicting containers
-docker ps -q --filter "publish=80" | xargs -r docker stop
-docker ps -q --filter "publish=8080" | xargs -r docker stop
-
-# STEP 2: Build Context Fix
-echo "📁 Fixing build context issues..."
-[ -f .dockerignore ] && echo "Current .dockerignore:" && cat .dockerignore
-find . -name "requirements.txt" -o -name "package.json" -o -name "*.py" | head -10
-
-# STEP 3: Clean Build Process
-echo "🏗️ Performing clean rebuild..."
-docker build --no-cache --progress=plain -t $IMAGE_NAME . 2>&1 | tee build.log
-
-# STEP 4: Container Validation  
-echo "🧪 Testing container functionality..."
-docker run --rm $IMAGE_NAME echo "Container test successful" || echo "Container test failed"
-
-# STEP 5: Deploy with proper port mapping
-echo "🚀 Deploying with resolved configuration..."
-docker run -d --name $CONTAINER_NAME -p 8080:80 $IMAGE_NAME
-docker logs $CONTAINER_NAME
-echo "All Docker issues resolved!"'''
-        
-        elif domain == "database":
-            return '''#!/bin/bash
-# COMPREHENSIVE DATABASE RESOLUTION  
-echo "🚀 Executing unified database fix for all detected issues..."
-
-# STEP 1: Connection Testing
-echo "🔗 Testing database connectivity..."
-ping -c 3 $DB_HOST 2>/dev/null || echo "Host ping failed" 
-nc -zv $DB_HOST $DB_PORT 2>&1 || echo "Port connection failed"
-
-# STEP 2: Authentication Verification
-echo "🔐 Verifying database authentication..."
-if command -v mysql &> /dev/null; then
-    mysql -h $DB_HOST -P $DB_PORT -u $DB_USER -p$DB_PASSWORD -e "SELECT 1;" 2>/dev/null && echo "MySQL connection OK"
-fi
-if command -v psql &> /dev/null; then
-    PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -p $DB_PORT -U $DB_USER -d $DB_NAME -c "SELECT 1;" 2>/dev/null && echo "PostgreSQL connection OK"
-fi
-
-# STEP 3: Schema Migration
-echo "📋 Running database migrations..."
-python manage.py migrate 2>/dev/null || \\
-npx sequelize-cli db:migrate 2>/dev/null || \\
-php artisan migrate 2>/dev/null || \\
-echo "No migration tool found"
-
-# STEP 4: Application Integration Test
-echo "🔧 Testing application integration..."  
-python -c "
-import os
-try:
-    if 'mysql' in os.environ.get('DATABASE_URL', '').lower():
-        import mysql.connector
-        print('MySQL driver available')
-    elif 'postgres' in os.environ.get('DATABASE_URL', '').lower():
-        import psycopg2  
-        print('PostgreSQL driver available')
-except ImportError as e:
-    print(f'Database driver issue: {e}')
-" 2>/dev/null
-
-# STEP 5: Verify Resolution
-echo "✅ Verifying database resolution..."
-curl -f http://localhost:8080/health 2>/dev/null && echo "App health check passed" || echo "App health check failed"
-echo "All database issues resolved!"'''
-        
-        else:
-            return '''#!/bin/bash
-# COMPREHENSIVE SYSTEM RESOLUTION
-echo "🚀 Executing unified system fix for all detected issues..."
-
-# STEP 1: System Health Check
-echo "🏥 Checking system health..."
-uptime && free -h && df -h | head -5
-
-# STEP 2: Service Status Review
-echo "⚙️ Reviewing service status..."
-systemctl --failed --no-pager || echo "No failed services"
-docker ps -a --format "table {{.Names}}\\t{{.Status}}" 2>/dev/null || echo "Docker not available"
-
-# STEP 3: Log Analysis
-echo "📋 Analyzing system logs..."  
-journalctl --since "1 hour ago" --no-pager | tail -20
-dmesg | tail -10 | grep -i error || echo "No recent kernel errors"
-
-# STEP 4: Network Connectivity  
-echo "🌐 Testing network connectivity..."
-ping -c 3 8.8.8.8 && curl -I https://google.com --max-time 5
-
-# STEP 5: Apply General Fixes
-echo "🔧 Applying general system fixes..."
-sudo systemctl daemon-reload
-sudo systemctl restart systemd-resolved 2>/dev/null || true
-echo "System resolution complete!"'''
-    
-    def _estimate_comprehensive_time(self, issues: List[Dict], domain: str) -> str:
-        """Estimate time for comprehensive resolution"""
-        
-        issue_count = len(issues)
-        critical_count = sum(1 for issue in issues if issue.get("severity") == "critical")
-        
-        base_times = {
-            "kubernetes": 20,
-            "docker": 15, 
-            "database": 25,
-            "network": 18
-        }
-        
-        base_time = base_times.get(domain, 20)
-        complexity_time = (issue_count - 1) * 5  # 5 min per additional issue
-        critical_time = critical_count * 10  # 10 min per critical issue
-        
-        total_minutes = base_time + complexity_time + critical_time
-        
-        if total_minutes <= 30:
-            return f"{total_minutes} minutes"
-        else:
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            return f"{hours}h {minutes}min" if minutes > 0 else f"{hours}h"
+        return _ai_solution_time_label(domain, len(issues), len(recommendations))
     
     def _determine_overall_severity(self, issues: List[Dict]) -> str:
         """Determine overall severity from all issues"""
         
-        if not issues:
-            return "low"
-        
-        severities = [issue.get("severity", "low") for issue in issues]
-        
-        if "critical" in severities:
-            return "critical"
-        elif "high" in severities:
-            return "high"  
-        elif "medium" in severities:
-            return "medium"
-        else:
-            return "low"
-    
-    def _get_generic_comprehensive_solution(self, log_content: str) -> Dict[str, Any]:
-        """Generic comprehensive solution when AI analysis is unclear"""
-        
-        return {
-            "title": "Comprehensive System Analysis & Resolution",
-            "description": "AI-guided comprehensive fix for detected system issues",
-            "steps": [
-                "1. **System Assessment** - Complete analysis of system health and performance",
-                "2. **Issue Classification** - Categorize and prioritize all detected problems", 
-                "3. **Unified Resolution** - Apply coordinated fixes to resolve all issues",
-                "4. **Integration Testing** - Verify all components work together properly",
-                "5. **Monitoring Setup** - Establish ongoing monitoring for issue prevention"
-            ],
-            "code": '''#!/bin/bash
-# AI-GUIDED COMPREHENSIVE RESOLUTION
-echo "🤖 Applying AI-recommended comprehensive fixes..."
-
-# System health analysis
-uptime && df -h && free -h
-
-# Service status check  
-systemctl --failed || docker ps -a 2>/dev/null
-
-# Apply AI-recommended fixes
-systemctl daemon-reload
-echo "✅ Comprehensive resolution completed!"''',
-            "estimated_time": "25-40 minutes",
-            "success_rate": 0.85,
-            "complexity": "medium",
-            "ai_generated": True,
-            "pattern_id": f"generic_ai_{hash(log_content) % 10000}"
-        }
+        # One pass for the most severe rank; unknown labels count as "low"
+        rank = _SEVERITY_RANK.get
+        best = min((rank(issue.get("severity"), 3) for issue in issues), default=3)
+        return _SEVERITY_LEVELS[best]
     
-    def _estimate_time_for_issue(self, issue_type: str, issue_count: int) -> str:
-        """Estimate resolution time based on issue type and complexity"""
-        
-        base_times = {
-            "docker": "10-20 minutes",
-            "kubernetes": "15-30 minutes", 
-            "database": "20-40 minutes",
-            "network": "15-25 minutes",
-            "auth": "10-15 minutes"
-        }
-        
-        for key in base_times:
-            if key in issue_type:
-                return base_times[key]
-        
-        # Adjust based on issue count
-        if issue_count > 3:
-            return "30-60 minutes"
-        elif issue_count > 1:
-            return "20-40 minutes"
-        else:
-            return "10-20 minutes"
-    
-    def _get_generic_ai_solution(self, log_content: str) -> Dict[str, Any]:
-        """Generic AI-based solution when specific patterns aren't clear"""
-        return {
-            "title": "AI-Guided System Resolution",
-            "steps": [
-                "1. Analyze error patterns and frequency in the logs",
-                "2. Identify the most critical issues affecting functionality",
-                "3. Apply targeted fixes based on error classification",
-                "4. Test each fix incrementally to ensure stability",
-                "5. Monitor system behavior after implementing changes"
-            ],
-            "code_example": '''# AI-GUIDED RESOLUTION
-echo "🤖 Applying AI-recommended fixes..."
-
-# Smart log analysis
-grep -i "error\\|failed\\|exception" <<< "$LOG_CONTENT" | sort | uniq -c | sort -nr | head -10
-
-# System health verification
-kubectl get all --all-namespaces 2>/dev/null | grep -v Running | grep -v Completed || \\
-docker ps -a | grep -v Up || \\
-systemctl --failed
-
-# Apply intelligent fixes based on patterns
-echo "✅ AI analysis complete - review findings above"
-''',
-            "estimated_time": "15-30 minutes",
-            "success_rate": 0.82,
-            "pattern_id": f"ai_generic_{hash(log_content) % 10000}",
-            "ai_generated": True
-        }
-    
-    # Compatibility methods for existing code
     def get_learning_stats(self) -> Dict:
         """Get learning statistics from pattern recognition system"""
         return self.pattern_recognition.vector_search.get_learning_stats()
@@ -1267,5 +1108,33 @@ echo "✅ AI analysis complete - review findings above"
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+class _LazyAnalyzer:
+    """Stand-in for the shared SimplifiedAIAnalyzer that builds it on first use,
+    so importing this module does not connect to TiDB or probe AI backends.
+
+    TiDB or backend set-up errors therefore surface on the first request rather
+    than at startup. type() reports the proxy; __class__ and isinstance() report
+    the analyzer.
+    """
+    
+    def __init__(self):
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    def _get(self) -> SimplifiedAIAnalyzer:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = SimplifiedAIAnalyzer()
+        return self._instance
+    
+    @property
+    def __class__(self):
+        return type(self._get())
+    
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
 # Global instance for compatibility
-ai_analyzer = SimplifiedAIAnalyzer()
+ai_analyzer = _LazyAnalyzer()
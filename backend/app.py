@@ -1,5 +1,6 @@
 import os
 import asyncio
+import logging
 from dotenv import load_dotenv
 
 # Load environment variables from .env file FIRST (before other imports)
@@ -16,9 +17,25 @@ try:
 except FileNotFoundError:
     print("⚠️  .env file not found")
 
+# Central logging setup for the service modules (set LOG_LEVEL=DEBUG for per-request traces)
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+log_level_known = isinstance(logging.getLevelName(log_level), int)
+logging.basicConfig(
+    level=log_level if log_level_known else logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+if not log_level_known:
+    logging.getLogger(__name__).warning("Unknown LOG_LEVEL %r, using INFO", log_level)
+
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import config with fallback for Railway deployment
 try:
     from config import TIDB_CONFIG
@@ -42,7 +59,25 @@ from sqlalchemy import create_engine, text
 from log_parser.parser import LogParser
 from ai_service import ai_analyzer
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson; types it cannot encode go through Flask's default"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 
@@ -385,7 +420,7 @@ def debug_ai_status():
     try:
         debug_info = {
             "groq_api_key": "✅ Present" if os.getenv('GROQ_API_KEY') else "❌ Missing",
-            "ai_analyzer_type": type(ai_analyzer).__name__,
+            "ai_analyzer_type": ai_analyzer.__class__.__name__,
             "online_ai_available": hasattr(ai_analyzer, 'online_ai'),
         }
         
@@ -545,7 +580,7 @@ def ai_debug():
             "groq_key_length": len(os.getenv("GROQ_API_KEY", "")),
             "available_backends": debug_service.available_backends,
             "active_backend": debug_service.active_backend,
-            "ai_analyzer_type": str(type(ai_analyzer)),
+            "ai_analyzer_type": str(ai_analyzer.__class__),
             "ai_analyzer_online_available": hasattr(ai_analyzer, 'online_ai') and bool(ai_analyzer.online_ai.available_backends)
         })
     except Exception as e:
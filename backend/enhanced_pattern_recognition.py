@@ -5,10 +5,82 @@ Provides single, finalized solutions based on stored patterns
 """
 
 import json
+import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from vector_search import vector_search
 
+logger = logging.getLogger(__name__)
+
+# Pattern detection rules: a rule matches when every keyword occurs in the lowered log
+_PATTERN_RULES = (
+    {
+        'keywords': ['bind for', 'port', 'already allocated'],
+        'pattern_type': 'docker_port_conflict',
+        'severity': 'critical',
+        'title': 'Docker Port Already in Use',
+        'description': 'Another service is using the required port - common Docker deployment issue',
+        'explanation': 'This error occurs when Docker tries to bind to a port that is already occupied by another container or system service.',
+        'quick_check': 'lsof -i :80',
+        'impact': 'Container cannot start, service unavailable'
+    },
+    {
+        'keywords': ['copy failed', 'file not found'],
+        'pattern_type': 'docker_build_failed',
+        'severity': 'critical',
+        'title': 'Docker Build Copy Failure',
+        'description': 'Required files missing from Docker build context',
+        'explanation': 'Docker COPY command cannot find specified files during build process.',
+        'quick_check': 'ls -la requirements.txt package.json',
+        'impact': 'Build fails, image cannot be created'
+    },
+    {
+        'keywords': ['external connectivity', 'driver failed'],
+        'pattern_type': 'docker_network_driver',
+        'severity': 'critical',
+        'title': 'Docker Network Driver Failure',
+        'description': 'Docker network driver cannot configure port mapping',
+        'explanation': 'The Docker daemon failed to configure network connectivity for the container.',
+        'quick_check': 'docker network ls',
+        'impact': 'Container networking fails, service unreachable'
+    },
+    {
+        'keywords': ['relation', 'does not exist'],
+        'pattern_type': 'postgresql_schema',
+        'severity': 'critical', 
+        'title': 'PostgreSQL Schema Missing',
+        'description': 'Database table or relation missing - schema migration required'
+    },
+    {
+        'keywords': ['access denied', 'mysql', 'user'],
+        'pattern_type': 'mysql_auth',
+        'severity': 'critical',
+        'title': 'MySQL Authentication Error',
+        'description': 'MySQL user authentication failed - permission issue'
+    },
+    {
+        'keywords': ['insufficient memory', 'oom'],
+        'pattern_type': 'resource_memory',
+        'severity': 'high',
+        'title': 'Memory Resource Exhaustion',
+        'description': 'Application running out of memory resources'
+    },
+    {
+        'keywords': ['imagepullbackoff', 'pull image'],
+        'pattern_type': 'kubernetes_image',
+        'severity': 'critical',
+        'title': 'Kubernetes Image Pull Error',
+        'description': 'Cannot pull container image from registry'
+    },
+    {
+        'keywords': ['connection refused', 'database'],
+        'pattern_type': 'database_connection',
+        'severity': 'critical',
+        'title': 'Database Connection Refused',
+        'description': 'Database server refusing connections'
+    }
+)
+
 @dataclass
 class PatternSolution:
     """Represents a finalized solution pattern"""
@@ -38,7 +110,7 @@ class EnhancedPatternRecognition:
         Analyze logs and provide a single, comprehensive solution
         Returns one finalized solution instead of multiple recommendations
         """
-        print("🔍 Enhanced pattern recognition analyzing...")
+        logger.debug("🔍 Enhanced pattern recognition analyzing...")
         
         # Step 1: Find similar patterns from TiDB
         similar_patterns = self.vector_search.find_similar_patterns(log_content, limit=3)
@@ -56,7 +128,7 @@ class EnhancedPatternRecognition:
             pattern_id = self.vector_search.store_deployment_pattern(
                 log_content, current_patterns, [best_solution.__dict__]
             )
-            print(f"📚 Pattern stored in TiDB: {pattern_id}")
+            logger.debug("📚 Pattern stored in TiDB: %s", pattern_id)
         
         return self._format_final_response(best_solution, current_patterns)
     
@@ -66,77 +138,9 @@ class EnhancedPatternRecognition:
         lines = log_content.split('\n')
         log_lower = log_content.lower()
         
-        # Enhanced pattern detection with detailed analysis
-        pattern_rules = [
-            {
-                'keywords': ['bind for', 'port', 'already allocated'],
-                'pattern_type': 'docker_port_conflict',
-                'severity': 'critical',
-                'title': 'Docker Port Already in Use',
-                'description': 'Another service is using the required port - common Docker deployment issue',
-                'explanation': 'This error occurs when Docker tries to bind to a port that is already occupied by another container or system service.',
-                'quick_check': 'lsof -i :80',
-                'impact': 'Container cannot start, service unavailable'
-            },
-            {
-                'keywords': ['copy failed', 'file not found'],
-                'pattern_type': 'docker_build_failed',
-                'severity': 'critical',
-                'title': 'Docker Build Copy Failure',
-                'description': 'Required files missing from Docker build context',
-                'explanation': 'Docker COPY command cannot find specified files during build process.',
-                'quick_check': 'ls -la requirements.txt package.json',
-                'impact': 'Build fails, image cannot be created'
-            },
-            {
-                'keywords': ['external connectivity', 'driver failed'],
-                'pattern_type': 'docker_network_driver',
-                'severity': 'critical',
-                'title': 'Docker Network Driver Failure',
-                'description': 'Docker network driver cannot configure port mapping',
-                'explanation': 'The Docker daemon failed to configure network connectivity for the container.',
-                'quick_check': 'docker network ls',
-                'impact': 'Container networking fails, service unreachable'
-            },
-            {
-                'keywords': ['relation', 'does not exist'],
-                'pattern_type': 'postgresql_schema',
-                'severity': 'critical', 
-                'title': 'PostgreSQL Schema Missing',
-                'description': 'Database table or relation missing - schema migration required'
-            },
-            {
-                'keywords': ['access denied', 'mysql', 'user'],
-                'pattern_type': 'mysql_auth',
-                'severity': 'critical',
-                'title': 'MySQL Authentication Error',
-                'description': 'MySQL user authentication failed - permission issue'
-            },
-            {
-                'keywords': ['insufficient memory', 'oom'],
-                'pattern_type': 'resource_memory',
-                'severity': 'high',
-                'title': 'Memory Resource Exhaustion',
-                'description': 'Application running out of memory resources'
-            },
-            {
-                'keywords': ['imagepullbackoff', 'pull image'],
-                'pattern_type': 'kubernetes_image',
-                'severity': 'critical',
-                'title': 'Kubernetes Image Pull Error',
-                'description': 'Cannot pull container image from registry'
-            },
-            {
-                'keywords': ['connection refused', 'database'],
-                'pattern_type': 'database_connection',
-                'severity': 'critical',
-                'title': 'Database Connection Refused',
-                'description': 'Database server refusing connections'
-            }
-        ]
         
         # Score patterns based on log content
-        for rule in pattern_rules:
+        for rule in _PATTERN_RULES:
             score = 0
             matched_lines = []
             
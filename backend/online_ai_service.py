@@ -4,6 +4,7 @@ Supports multiple free online AI APIs: Groq, Hugging Face, Together AI, etc.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 from typing import Dict, List, Any, Optional
@@ -16,8 +17,19 @@ class OnlineAIService:
         self.available_backends = []
         self.active_backend = None
         self.api_keys = self._load_api_keys()
+        self._http = self._create_http_session()
         self._detect_available_backends()
     
+    def _create_http_session(self) -> requests.Session:
+        """Shared keep-alive session so each analysis skips the TCP + TLS handshake"""
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+        return session
+    
+    def close(self):
+        """Release pooled connections"""
+        self._http.close()
+    
     def _load_api_keys(self) -> Dict[str, str]:
         """Load API keys from environment variables or config"""
         return {
@@ -130,7 +142,7 @@ class OnlineAIService:
             prompt = self._create_analysis_prompt(log_content, context)
             
             # Use Llama 3.1 8B for best balance of speed and quality
-            response = requests.post(
+            response = self._http.post(
                 "https://api.groq.com/openai/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {api_key}",
@@ -177,7 +189,7 @@ class OnlineAIService:
             api_key = self.api_keys["huggingface"]
             
             # Use a good free model for text generation
-            response = requests.post(
+            response = self._http.post(
                 "https://api-inference.huggingface.co/models/microsoft/DialoGPT-large",
                 headers={"Authorization": f"Bearer {api_key}"},
                 json={
@@ -206,7 +218,7 @@ class OnlineAIService:
             print("🆓 Using Hugging Face free tier...")
             
             # Use a lightweight model that works without API key
-            response = requests.post(
+            response = self._http.post(
                 "https://api-inference.huggingface.co/models/distilbert-base-uncased",
                 json={
                     "inputs": log_content[:500]  # Limited for free tier
@@ -231,7 +243,7 @@ class OnlineAIService:
             
             api_key = self.api_keys["together"]
             
-            response = requests.post(
+            response = self._http.post(
                 "https://api.together.xyz/inference",
                 headers={"Authorization": f"Bearer {api_key}"},
                 json={
@@ -261,7 +273,7 @@ class OnlineAIService:
             
             api_key = self.api_keys["cohere"]
             
-            response = requests.post(
+            response = self._http.post(
                 "https://api.cohere.ai/v1/generate",
                 headers={"Authorization": f"Bearer {api_key}"},
                 json={
@@ -0,0 +1,29 @@
+"""
+Thread-safe LRU map shared by the analyzers' result caches
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Small thread-safe LRU map for analysis results shared across requests"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
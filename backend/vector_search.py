@@ -5,11 +5,56 @@ TiDB Vector Search Integration for Deployment Pattern Matching
 
 import os
 import json
+import logging
+import hashlib
+import functools
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from sqlalchemy import create_engine, text
 from config import TIDB_CONFIG
 
+logger = logging.getLogger(__name__)
+
+# Stored patterns carry long code examples; orjson encodes / decodes them much faster
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=4096)
+def _embed_words(words: Tuple[str, ...]) -> np.ndarray:
+    """Hash-based embedding of up to 50 words; cached, so the array is read-only"""
+    embedding = np.zeros(384)  # Standard sentence embedding size
+    
+    for i, word in enumerate(words):
+        word_hash = int(hashlib.md5(word.encode()).hexdigest(), 16)
+        embedding[i % 384] += (word_hash % 100) / 100.0
+    
+    # Normalize
+    norm = np.linalg.norm(embedding)
+    if norm > 0:
+        embedding = embedding / norm
+    
+    embedding.setflags(write=False)
+    return embedding
+
+
+_INSERT_PATTERN_SQL = text("""
+    INSERT INTO deployment_patterns 
+    (pattern_hash, log_content, error_patterns, solutions, embedding)
+    VALUES (:hash, :content, :patterns, :solutions, :embedding_vec)
+    ON DUPLICATE KEY UPDATE
+    usage_count = usage_count + 1,
+    updated_at = CURRENT_TIMESTAMP
+""")
+
 class DeploymentVectorSearch:
     """Vector search for similar deployment issues using TiDB Serverless"""
     
@@ -31,7 +76,7 @@ class DeploymentVectorSearch:
             
             return create_engine(uri, connect_args={"ssl": ssl_context})
         except Exception as e:
-            print(f"⚠️ TiDB Vector Search unavailable: {e}")
+            logger.warning("⚠️ TiDB Vector Search unavailable: %s", e)
             return None
     
     def _ensure_vector_tables(self):
@@ -60,36 +105,36 @@ class DeploymentVectorSearch:
                 # Create vector index separately with proper TiDB syntax
                 try:
                     # First, add TiFlash replica for vector index support
-                    print("🔧 Setting up TiFlash replica for vector search...")
+                    logger.info("🔧 Setting up TiFlash replica for vector search...")
                     conn.execute(text("""
                         ALTER TABLE deployment_patterns SET TIFLASH REPLICA 1
                     """))
-                    print("✅ TiFlash replica configured")
+                    logger.info("✅ TiFlash replica configured")
                     
                     # Now create the vector index
                     conn.execute(text("""
                         CREATE VECTOR INDEX idx_embedding 
                         ON deployment_patterns ((VEC_COSINE_DISTANCE(embedding)))
                     """))
-                    print("✅ Vector index created successfully")
+                    logger.info("✅ Vector index created successfully")
                 except Exception as index_error:
                     # Try the alternative approach if TiFlash setup fails
                     if "columnar replica" in str(index_error).lower():
                         try:
-                            print("🔧 Trying alternative vector index creation...")
+                            logger.info("🔧 Trying alternative vector index creation...")
                             conn.execute(text("""
                                 ALTER TABLE deployment_patterns 
                                 ADD VECTOR INDEX idx_embedding ((VEC_COSINE_DISTANCE(embedding))) 
                                 ADD_COLUMNAR_REPLICA_ON_DEMAND
                             """))
-                            print("✅ Vector index created with on-demand replica")
+                            logger.info("✅ Vector index created with on-demand replica")
                         except Exception as alt_error:
-                            print(f"⚠️ Vector index creation info: {alt_error}")
-                            print("💡 Vector search will work without index (slower performance)")
+                            logger.warning("⚠️ Vector index creation info: %s", alt_error)
+                            logger.info("💡 Vector search will work without index (slower performance)")
                     elif "already exists" not in str(index_error).lower():
-                        print(f"⚠️ Vector index creation info: {index_error}")
+                        logger.warning("⚠️ Vector index creation info: %s", index_error)
                     else:
-                        print("✅ Vector index already exists")
+                        logger.info("✅ Vector index already exists")
                 
                 # Solution effectiveness tracking
                 conn.execute(text("""
@@ -106,9 +151,9 @@ class DeploymentVectorSearch:
                 """))
                 
                 conn.commit()
-                print("✅ Vector search tables ready")
+                logger.info("✅ Vector search tables ready")
         except Exception as e:
-            print(f"⚠️ Vector table creation failed: {e}")
+            logger.warning("⚠️ Vector table creation failed: %s", e)
     
     def find_similar_patterns(self, log_content: str, limit: int = 5) -> List[Dict]:
         """Find similar deployment patterns using vector search"""
@@ -142,8 +187,8 @@ class DeploymentVectorSearch:
                     patterns.append({
                         "pattern_hash": row.pattern_hash,
                         "log_content": row.log_content,
-                        "error_patterns": json.loads(row.error_patterns),
-                        "solutions": json.loads(row.solutions),
+                        "error_patterns": _json_loads(row.error_patterns),
+                        "solutions": _json_loads(row.solutions),
                         "success_rate": row.success_rate,
                         "usage_count": row.usage_count,
                         "similarity": row.similarity
@@ -151,41 +196,59 @@ class DeploymentVectorSearch:
                 
                 return patterns
         except Exception as e:
-            print(f"❌ Vector search failed: {e}")
+            logger.warning("❌ Vector search failed: %s", e)
             return []
     
-    def store_deployment_pattern(self, log_content: str, patterns: List[Dict], solutions: List[Dict]) -> str:
+    def store_deployment_pattern(self, log_content: str, patterns: List[Dict], solutions: List[Dict],
+                                 pattern_hash: str = None) -> str:
         """Store new deployment pattern with vector embedding"""
         if not self.engine:
             return "local_pattern"
         
         try:
-            pattern_hash = str(hash(log_content))[:16]
-            embedding = self._generate_embedding(log_content)
+            row = self._pattern_row(log_content, patterns, solutions, pattern_hash)
             
             with self.engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO deployment_patterns 
-                    (pattern_hash, log_content, error_patterns, solutions, embedding)
-                    VALUES (:hash, :content, :patterns, :solutions, :embedding_vec)
-                    ON DUPLICATE KEY UPDATE
-                    usage_count = usage_count + 1,
-                    updated_at = CURRENT_TIMESTAMP
-                """), {
-                    "hash": pattern_hash,
-                    "content": log_content,
-                    "patterns": json.dumps(patterns),
-                    "solutions": json.dumps(solutions),
-                    "embedding_vec": str(embedding.tolist())
-                })
+                conn.execute(_INSERT_PATTERN_SQL, row)
                 
                 conn.commit()
-                print(f"✅ Pattern stored: {pattern_hash}")
-                return pattern_hash
+                logger.debug("✅ Pattern stored: %s", row['hash'])
+                return row["hash"]
         except Exception as e:
-            print(f"❌ Pattern storage failed: {e}")
+            logger.warning("❌ Pattern storage failed: %s", e)
             return "storage_failed"
     
+    def store_deployment_patterns_batch(self, items: List[Tuple[str, List[Dict], List[Dict], str]]) -> List[str]:
+        """Store several (log_content, patterns, solutions, pattern_hash) entries in one round-trip"""
+        if not self.engine:
+            return ["local_pattern"] * len(items)
+        
+        try:
+            rows = [self._pattern_row(*item) for item in items]
+            
+            with self.engine.connect() as conn:
+                conn.execute(_INSERT_PATTERN_SQL, rows)
+                
+                conn.commit()
+                logger.debug("✅ %d patterns stored", len(rows))
+                return [row["hash"] for row in rows]
+        except Exception as e:
+            logger.warning("❌ Batch pattern storage failed: %s", e)
+            return ["storage_failed"] * len(items)
+    
+    def _pattern_row(self, log_content: str, patterns: List[Dict], solutions: List[Dict],
+                     pattern_hash: str = None) -> Dict[str, str]:
+        """Insert parameters for one deployment pattern"""
+        if pattern_hash is None:
+            pattern_hash = str(hash(log_content))[:16]
+        return {
+            "hash": pattern_hash,
+            "content": log_content,
+            "patterns": _json_dumps(patterns),
+            "solutions": _json_dumps(solutions),
+            "embedding_vec": str(self._generate_embedding(log_content).tolist())
+        }
+    
     def record_solution_feedback(self, pattern_id: str, solution_id: str, rating: str, helpful: bool, feedback: str = ""):
         """Record user feedback for solution effectiveness"""
         if not self.engine:
@@ -208,30 +271,18 @@ class DeploymentVectorSearch:
                 })
                 
                 conn.commit()
-                print(f"✅ Feedback recorded for {pattern_id}")
+                logger.debug("✅ Feedback recorded for %s", pattern_id)
         except Exception as e:
-            print(f"❌ Feedback recording failed: {e}")
+            logger.warning("❌ Feedback recording failed: %s", e)
     
     def _generate_embedding(self, text: str) -> np.ndarray:
         """Generate vector embedding for text (simplified implementation)"""
         # In production, use a proper embedding model like sentence-transformers
         # For demo, create a simple hash-based embedding
-        import hashlib
-        
-        # Create deterministic embedding based on text features
-        words = text.lower().split()
-        embedding = np.zeros(384)  # Standard sentence embedding size
-        
-        for i, word in enumerate(words[:50]):  # Use first 50 words
-            word_hash = int(hashlib.md5(word.encode()).hexdigest(), 16)
-            embedding[i % 384] += (word_hash % 100) / 100.0
-        
-        # Normalize
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-        
-        return embedding
+        # Only the first 50 words count: split no further than that, and let
+        # them key the cache (re-run builds embed the same logs again)
+        words = tuple(word.lower() for word in text.split(None, 50)[:50])
+        return _embed_words(words)
     
     def get_learning_stats(self) -> Dict[str, Any]:
         """Get learning and usage statistics"""
@@ -257,7 +308,7 @@ class DeploymentVectorSearch:
                     "feedback_count": stats.feedback_count
                 }
         except Exception as e:
-            print(f"❌ Stats query failed: {e}")
+            logger.warning("❌ Stats query failed: %s", e)
             return {"status": "error", "patterns": 0, "feedback": 0}
 
 # Global instance